@@ -0,0 +1,101 @@
+"""Bulk write-back of normalized lead fields posted by the cleaning agent."""
+
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from leads.models import Lead
+
+from .serializers import CleanedLeadIn
+
+# CharFields on Lead are NOT NULL; a null from the cleaner is stored as blank
+BLANK_IF_NULL = {"region"}
+# a null here means the cleaner could not normalize the value: keep the stored one
+KEEP_IF_NULL = {"phone"}
+
+
+def _batches(items, size):
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _validate_rows(batch):
+    """
+    Return ``{lead_id: (fields, seen_updated_at)}`` and the rejected count.
+
+    ``seen_updated_at`` is the ``updated_at`` of the lead the cleaner read, if
+    it sent one; a later duplicate of a lead wins.
+    """
+    rows = {}
+    rejected = 0
+    for row in batch:
+        s = CleanedLeadIn(data=row)
+        if not s.is_valid():
+            rejected += 1
+            continue
+        fields = dict(s.validated_data)
+        for name in BLANK_IF_NULL & fields.keys():
+            if fields[name] is None:
+                fields[name] = ""
+        for name in KEEP_IF_NULL & fields.keys():
+            if fields[name] is None:
+                del fields[name]
+        lead_id = fields.pop("id")
+        seen_updated_at = fields.pop("updated_at", None)
+        rows[lead_id] = (fields, seen_updated_at)
+    return rows, rejected
+
+
+def _apply(rows):
+    """Write one batch; returns the number of updated and of stale leads."""
+    fields = set().union(*(f for f, _ in rows.values()))
+    now = timezone.now()
+    with transaction.atomic():
+        leads = (
+            Lead.objects.select_for_update()
+            .only("id", "updated_at", *fields)
+            .in_bulk(rows)
+        )
+        fresh = []
+        for lead_id, lead in leads.items():
+            values, seen_updated_at = rows[lead_id]
+            # changed after the cleaner read it: leave it pending for the next run
+            if seen_updated_at is not None and lead.updated_at != seen_updated_at:
+                continue
+            for name, value in values.items():
+                setattr(lead, name, value)
+            # auto_now is skipped by bulk_update; equal timestamps mark the
+            # lead as clean until it is modified again
+            lead.updated_at = lead.cleaned_at = now
+            fresh.append(lead)
+        Lead.objects.bulk_update(fresh, [*fields, "updated_at", "cleaned_at"])
+    return len(fresh), len(leads) - len(fresh)
+
+
+def update_cleaned_leads(items, batch_size=None):
+    """
+    Apply cleaned fields to existing leads in fixed-size transaction batches.
+
+    ``items`` may be any iterable (e.g. a streamed NDJSON body); it is consumed
+    one batch at a time. Each batch loads its leads with one ``in_bulk`` query
+    and writes them back with one ``bulk_update``; only fields present in the
+    batch are written, and ``cleaned_at`` is stamped. Rows that fail validation
+    or point at unknown leads are rejected. Rows carrying an ``updated_at``
+    older than the stored one are stale (the lead changed while it was being
+    cleaned) and are skipped, so the lead stays pending.
+
+    Returns:
+        dict: ``{"updated": int, "rejected": int, "stale": int}``.
+    """
+    batch_size = batch_size or settings.LEADS_CLEANED_BATCH_SIZE
+    updated = rejected = stale = 0
+    for batch in _batches(items, batch_size):
+        rows, n_rejected = _validate_rows(batch)
+        n_updated, n_stale = _apply(rows) if rows else (0, 0)
+        updated += n_updated
+        stale += n_stale
+        rejected += n_rejected + len(rows) - n_updated - n_stale
+    return {"updated": updated, "rejected": rejected, "stale": stale}
@@ -0,0 +1,133 @@
+"""Bulk upsert of LeadCompanyMatch rows posted by the scoring agent."""
+
+import operator
+from collections import defaultdict
+from functools import reduce
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from companies.models import Company
+from leads.models import Lead, LeadCompanyMatch
+
+from .serializers import LeadCompanyMatchIn
+
+# OR terms per existence query; keeps the WHERE clause within SQLite's
+# expression depth limit
+EXISTING_PAIRS_LEADS_PER_QUERY = 200
+
+
+def _validate_rows(items):
+    """
+    Validate raw rows and collapse them to ``{(lead_id, company_id): score}``.
+
+    All rows go through one ``many=True`` serializer. Returns the valid pairs,
+    the number of rejected rows and the number of duplicates: rows repeating
+    a pair that a later row of the request overrides (the later one wins).
+    """
+    s = LeadCompanyMatchIn(data=items, many=True)
+    rejected = 0
+    if s.is_valid():
+        rows = s.validated_data
+    else:
+        errors = s.errors
+        if isinstance(errors, dict) and "non_field_errors" in errors:
+            # not a list of rows at all
+            return {}, len(items), 0
+        # per-row errors, keyed by position (a list in older DRF versions)
+        if isinstance(errors, list):
+            errors = dict(enumerate(errors))
+        # the list fails as a whole; validate again without the bad rows
+        valid = [row for i, row in enumerate(items) if not errors.get(i)]
+        rejected = len(items) - len(valid)
+        s = LeadCompanyMatchIn(data=valid, many=True)
+        s.is_valid(raise_exception=True)
+        rows = s.validated_data
+    pairs = {}
+    for d in rows:
+        pairs[(d["lead_id"], d["company_id"])] = d["compatibility_score"]
+    return pairs, rejected, len(rows) - len(pairs)
+
+
+def _existing_pairs(keys):
+    """
+    The ``(lead_id, company_id)`` pairs of ``keys`` that already have a match.
+
+    Filters on the exact pairs, one ``lead_id = … AND company_id IN (…)`` term
+    per lead, rather than on every lead × company combination of the batch.
+    """
+    by_lead = defaultdict(set)
+    for lead_id, company_id in keys:
+        by_lead[lead_id].add(company_id)
+    existing = set()
+    leads = list(by_lead.items())
+    for start in range(0, len(leads), EXISTING_PAIRS_LEADS_PER_QUERY):
+        chunk = leads[start : start + EXISTING_PAIRS_LEADS_PER_QUERY]
+        match = reduce(
+            operator.or_,
+            (Q(lead_id=lead_id, company_id__in=ids) for lead_id, ids in chunk),
+        )
+        existing.update(
+            LeadCompanyMatch.objects.filter(match).values_list("lead_id", "company_id")
+        )
+    return existing
+
+
+def upsert_matches(items, batch_size=None):
+    """
+    Insert or update match rows in fixed-size transaction batches.
+
+    Lead and company IDs are resolved with one ``in_bulk`` query per model;
+    rows pointing at unknown IDs are rejected. Existing ``(lead, company)``
+    pairs get their score and ``matched_at`` refreshed. A pair sent more than
+    once is applied with its last score; the earlier rows count as
+    ``duplicates``, so the four counts add up to the number of input rows.
+
+    Returns:
+        dict: ``{"created": int, "updated": int, "rejected": int,
+        "duplicates": int}``.
+    """
+    batch_size = batch_size or settings.MATCHES_INGEST_BATCH_SIZE
+    pairs, rejected, duplicates = _validate_rows(items)
+
+    known_leads = Lead.objects.only("id").in_bulk({k[0] for k in pairs})
+    known_companies = Company.objects.only("id").in_bulk({k[1] for k in pairs})
+    rows = []
+    for (lead_id, company_id), score in pairs.items():
+        if lead_id in known_leads and company_id in known_companies:
+            rows.append((lead_id, company_id, score))
+        else:
+            rejected += 1
+
+    created = updated = 0
+    now = timezone.now()
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        with transaction.atomic():
+            existing = _existing_pairs([(lead_id, cid) for lead_id, cid, _ in batch])
+            LeadCompanyMatch.objects.bulk_create(
+                [
+                    LeadCompanyMatch(
+                        lead_id=lead_id,
+                        company_id=company_id,
+                        compatibility_score=score,
+                        matched_at=now,
+                    )
+                    for lead_id, company_id, score in batch
+                ],
+                update_conflicts=True,
+                unique_fields=["lead", "company"],
+                update_fields=["compatibility_score", "matched_at"],
+            )
+        n_existing = sum((lead_id, cid) in existing for lead_id, cid, _ in batch)
+        updated += n_existing
+        created += len(batch) - n_existing
+
+    return {
+        "created": created,
+        "updated": updated,
+        "rejected": rejected,
+        "duplicates": duplicates,
+    }
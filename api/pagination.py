@@ -0,0 +1,136 @@
+import base64
+import json
+from datetime import datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a fixed, unique ordering.
+
+    The cursor encodes the ordering values of the last row of a page and the
+    next page filters strictly after them, so deep pages cost O(page) instead
+    of growing with an OFFSET. ``ordering`` must end with a unique field.
+    """
+
+    ordering = ("-id",)
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    default_limit = 100
+    max_limit = 1000
+    invalid_cursor_message = "Invalid cursor"
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.default_limit
+        return max(1, min(limit, self.max_limit))
+
+    def decode_cursor(self, request, model):
+        """
+        The position encoded in the request's cursor, or None without one.
+
+        Each value is converted with its ordering field of ``model``; a cursor
+        that does not decode to such values raises NotFound.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            position = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if any(value is None for value in position):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        raw = json.dumps(
+            [v.isoformat() if isinstance(v, datetime) else v for v in position]
+        )
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    def _after(self, position):
+        """Build ``(a, b, c) > (va, vb, vc)`` honouring each field's direction."""
+        clauses = []
+        for i, field in enumerate(self.ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            equal = {f.lstrip("-"): v for f, v in zip(self.ordering[:i], position)}
+            clauses.append(Q(**equal, **{f"{name}__{lookup}": position[i]}))
+        return reduce(or_, clauses)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        page = list(queryset[: self.limit + 1])
+        self.next_position = None
+        if len(page) > self.limit:
+            page = page[: self.limit]
+            last = page[-1]
+            self.next_position = [getattr(last, f.lstrip("-")) for f in self.ordering]
+        return page
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class MatchScorePagination(KeysetPagination):
+    """Best matches first; ties broken by newest id."""
+
+    ordering = ("-compatibility_score", "-id")
+
+
+class LeadsToCleanPagination(KeysetPagination):
+    """Newest leads first, like the previous ``[:limit]`` slice."""
+
+    ordering = ("-created_at", "-id")
+
+
+class PendingCleaningPagination(KeysetPagination):
+    """Oldest change first, so one pass drains the cleaning backlog in order."""
+
+    ordering = ("updated_at", "id")
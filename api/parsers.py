@@ -0,0 +1,27 @@
+import json
+
+from rest_framework.parsers import BaseParser
+
+
+class NDJSONParser(BaseParser):
+    """
+    Newline-delimited JSON, one object per line.
+
+    Returns a lazy iterator over the request stream so large bodies are
+    decoded line by line; a line that is not valid JSON yields None.
+    """
+
+    media_type = "application/x-ndjson"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return self._iter_lines(stream) if stream is not None else iter(())
+
+    @staticmethod
+    def _iter_lines(stream):
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
@@ -31,6 +31,25 @@ class LeadCompanyMatchIn(serializers.Serializer):
     compatibility_score = serializers.FloatField(min_value=0.0, max_value=1.0)
 
 
+class CleanedLeadIn(serializers.Serializer):
+    """Normalized fields written back by the cleaning agent; all but ``id`` optional."""
+
+    id = serializers.IntegerField()
+    rough_budget_normalized_euro = serializers.DecimalField(
+        max_digits=12, decimal_places=2, allow_null=True, required=False
+    )
+    first_contacted_at = serializers.DateTimeField(allow_null=True, required=False)
+    region = serializers.CharField(
+        max_length=100, allow_blank=True, allow_null=True, required=False
+    )
+    phone = serializers.CharField(
+        max_length=50, allow_blank=True, allow_null=True, required=False
+    )
+    status = serializers.ChoiceField(choices=Lead.STATUS_CHOICES, required=False)
+    # the lead's updated_at as read by the cleaner, to detect concurrent edits
+    updated_at = serializers.DateTimeField(required=False)
+
+
 class LeadCompanyMatchReportSerializer(serializers.ModelSerializer):
     """Serializer exposing both lead and company context for reporting."""
 
@@ -0,0 +1,79 @@
+"""Database-side aggregates over LeadCompanyMatch for the reporting agent."""
+
+import math
+
+from django.db.models import Avg, Count, Max
+
+TOP_N = 5
+
+# (output name, lookup on LeadCompanyMatch)
+CATEGORIES = [
+    ("industry", "company__industry"),
+    ("region", "company__region"),
+    ("budget_normalized_euro", "company__typical_project_budget_euro"),
+]
+
+
+def _quantile(queryset, count, q):
+    """
+    Linear-interpolated quantile of ``compatibility_score`` (pandas' default).
+
+    Reads at most two rows through the score index instead of every row.
+    """
+    pos = q * (count - 1)
+    lo, hi = math.floor(pos), math.ceil(pos)
+    values = list(
+        queryset.order_by("compatibility_score").values_list(
+            "compatibility_score", flat=True
+        )[lo : hi + 1]
+    )
+    return values[0] + (values[-1] - values[0]) * (pos - lo)
+
+
+def _top_values(queryset, name, lookup):
+    # one extra row in case the blank group is among the most frequent
+    rows = (
+        queryset.exclude(**{f"{lookup}__isnull": True})
+        .values(lookup)
+        .annotate(count=Count("id"))
+        .order_by("-count", lookup)[: TOP_N + 1]
+    )
+    top = [
+        {name: str(row[lookup]).strip(), "count": row["count"]}
+        for row in rows
+        if str(row[lookup]).strip()
+    ]
+    return top[:TOP_N]
+
+
+def match_stats(queryset):
+    """
+    Summarize matches with the same shape the reporting agent used to compute.
+
+    Returns:
+        dict: ``{"count", "score": {"mean", "median", "p90", "max"},
+        "top_industries", "top_regions", "top_budget_normalized_euros"}``,
+        or ``{"count": 0}`` when there are no matches.
+    """
+    agg = queryset.aggregate(
+        count=Count("id"),
+        mean=Avg("compatibility_score"),
+        max=Max("compatibility_score"),
+    )
+    count = agg["count"]
+    if not count:
+        return {"count": 0}
+
+    out = {
+        "count": count,
+        "score": {
+            "mean": round(agg["mean"], 3),
+            "median": round(_quantile(queryset, count, 0.5), 3),
+            "p90": round(_quantile(queryset, count, 0.9), 3),
+            "max": round(agg["max"], 3),
+        },
+    }
+    for name, lookup in CATEGORIES:
+        key = "top_industries" if name == "industry" else f"top_{name}s"
+        out[key] = _top_values(queryset, name, lookup)
+    return out
@@ -4,9 +4,12 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CompanyViewSet,
     LeadCompanyMatchReportView,
+    LeadCompanyMatchStatsView,
     LeadCompanyMatchViewSet,
     LeadsToCleanView,
     LeadViewSet,
+    PendingLeadsToCleanView,
+    cleaned_leads,
     ingest_matches,
 )
 
@@ -19,7 +22,14 @@ urlpatterns = [
     path(
         "matches/report/", LeadCompanyMatchReportView.as_view(), name="matches-report"
     ),
+    path("matches/stats/", LeadCompanyMatchStatsView.as_view(), name="matches-stats"),
     path("leads/to-clean/", LeadsToCleanView.as_view(), name="leads-to-clean"),
+    path(
+        "leads/to-clean/pending/",
+        PendingLeadsToCleanView.as_view(),
+        name="leads-to-clean-pending",
+    ),
+    path("leads/cleaned/", cleaned_leads, name="leads-cleaned"),
     path("matches/ingest/", ingest_matches, name="matches-ingest"),
     path("", include(router.urls)),
 ]
@@ -1,19 +1,27 @@
-from django.utils import timezone
-from rest_framework import generics, status, viewsets
-from rest_framework.decorators import api_view
+from rest_framework import generics, viewsets
+from rest_framework.decorators import api_view, parser_classes
+from rest_framework.parsers import JSONParser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from companies.models import Company
-from leads.models import Lead, LeadCompanyMatch
-
+from leads.models import PENDING_CLEANING, Lead, LeadCompanyMatch
+
+from .cleaned import update_cleaned_leads
+from .ingest import upsert_matches
+from .pagination import (
+    LeadsToCleanPagination,
+    MatchScorePagination,
+    PendingCleaningPagination,
+)
+from .parsers import NDJSONParser
 from .serializers import (
     CompanySerializer,
-    LeadCompanyMatchIn,
     LeadCompanyMatchReportSerializer,
     LeadCompanyMatchSerializer,
     LeadSerializer,
 )
+from .stats import match_stats
 
 
 class CompanyViewSet(viewsets.ModelViewSet):
@@ -33,59 +41,82 @@ class LeadViewSet(viewsets.ModelViewSet):
 class LeadCompanyMatchViewSet(viewsets.ModelViewSet):
     """API endpoint to view lead-company matches."""
 
-    queryset = LeadCompanyMatch.objects.all().order_by("-compatibility_score")
+    queryset = LeadCompanyMatch.objects.select_related("lead", "company").order_by(
+        "-compatibility_score", "-id"
+    )
     serializer_class = LeadCompanyMatchSerializer
+    pagination_class = MatchScorePagination
+
 
+class LeadsToCleanView(generics.ListAPIView):
+    """
+    API endpoint to fetch leads that need cleaning (status 'new').
 
-class LeadsToCleanView(APIView):
-    """API endpoint to fetch leads that need cleaning."""
+    Pages are cursor-based; follow ``next`` until it is null.
+    """
 
-    def get(self, request):
-        """Fetch leads with status 'new' that need cleaning."""
-        limit = int(request.query_params.get("limit", 100))
+    queryset = Lead.objects.filter(status="new").order_by("-created_at", "-id")
+    serializer_class = LeadSerializer
+    pagination_class = LeadsToCleanPagination
+
+
+class PendingLeadsToCleanView(generics.ListAPIView):
+    """
+    API endpoint to fetch leads never cleaned or changed since their last cleaning.
+
+    Writing a lead back through ``/api/leads/cleaned/`` sets its ``cleaned_at``,
+    which drops it from this list until its fields change again. Pages are
+    ordered by ``(updated_at, id)`` and cursor-based.
+    """
+
+    queryset = Lead.objects.filter(PENDING_CLEANING).order_by("updated_at", "id")
+    serializer_class = LeadSerializer
+    pagination_class = PendingCleaningPagination
 
-        queryset = Lead.objects.filter(status="new").order_by("-created_at")[:limit]
 
-        serializer = LeadSerializer(queryset, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+@api_view(["POST"])
+@parser_classes([JSONParser, NDJSONParser])
+def cleaned_leads(request):
+    """
+    Writes normalized fields of many leads back in bulk.
+
+    Body: {"leads": [{"id":.., "rough_budget_normalized_euro":.., "first_contacted_at":..,
+    "region":.., "phone":.., "status":.., "updated_at":..}, ...]}, or the same
+    objects as NDJSON (Content-Type: application/x-ndjson), which is applied
+    while it is read. ``updated_at`` is the value the cleaner read; leads changed
+    since then are skipped as stale.
+    Responds with the number of updated, rejected and stale rows.
+    """
+    items = request.data
+    if isinstance(items, dict):
+        items = items.get("leads", [])
+    return Response(update_cleaned_leads(items))
 
 
 @api_view(["POST"])
 def ingest_matches(request):
     """
-    Accepts a list of match rows and writes them to LeadCompanyMatch.
+    Accepts a list of match rows and upserts them into LeadCompanyMatch.
     Expected body: {"matches":[{"lead_id":..,"company_id":..,"compatibility_score":..}, ...]}
+    Responds with the number of created, updated and rejected rows.
     """
     items = request.data.get("matches", [])
     if not items:
         return Response({"created": 0, "detail": "No matches provided"}, status=400)
 
-    created = []
-    for row in items:
-        s = LeadCompanyMatchIn(data=row)
-        if not s.is_valid():
-            continue
-        d = s.validated_data
-        try:
-            lead = Lead.objects.get(pk=d["lead_id"])
-            company = Company.objects.get(pk=d["company_id"])
-        except (Lead.DoesNotExist, Company.DoesNotExist):
-            continue
-        created.append(
-            LeadCompanyMatch(
-                lead=lead,
-                company=company,
-                compatibility_score=d["compatibility_score"],
-                matched_at=timezone.now(),
-            )
-        )
-
-    if created:
-        LeadCompanyMatch.objects.bulk_create(created, ignore_conflicts=True)
-
-    return Response({"created": len(created)})
+    return Response(upsert_matches(items))
+
+
+class LeadCompanyMatchStatsView(APIView):
+    """Aggregate score statistics and top categories over all matches."""
+
+    def get(self, request):
+        return Response(match_stats(LeadCompanyMatch.objects.all()))
 
 
 class LeadCompanyMatchReportView(generics.ListAPIView):
+    """Best matches first, paginated with ``limit`` and an opaque ``cursor``."""
+
     queryset = LeadCompanyMatch.objects.select_related("lead", "company").all()
     serializer_class = LeadCompanyMatchReportSerializer
+    pagination_class = MatchScorePagination
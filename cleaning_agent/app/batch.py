@@ -0,0 +1,94 @@
+"""Parallel batch cleaning on a process pool.
+
+Parsing dates, validating phone numbers and fuzzy matching are CPU-bound, so
+batches are split evenly across the workers and cleaned in worker processes
+instead of inside the event loop.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.cleaner import cache_stats, clean_leads
+
+CLEAN_WORKERS = int(os.getenv("CLEAN_WORKERS", str(os.cpu_count() or 1)))
+CLEAN_CHUNK_SIZE = int(os.getenv("CLEAN_CHUNK_SIZE", "500"))
+# chunks are not made smaller than this: below it pickling costs more than it saves
+CLEAN_MIN_CHUNK_SIZE = int(os.getenv("CLEAN_MIN_CHUNK_SIZE", "100"))
+
+
+def clean_chunk(leads: list):
+    """
+    Clean one chunk of leads (runs inside a worker process).
+
+    Returns the worker pid, the cleaned leads and the worker's normalizer
+    cache counters so the parent can report them.
+    """
+    return os.getpid(), clean_leads(leads), cache_stats()
+
+
+class BatchCleaner:
+    """Fan chunks of leads out to a process pool, keeping their order."""
+
+    def __init__(
+        self,
+        workers: int = CLEAN_WORKERS,
+        chunk_size: int = CLEAN_CHUNK_SIZE,
+        min_chunk_size: int = CLEAN_MIN_CHUNK_SIZE,
+    ):
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size)
+        self.min_chunk_size = max(1, min(min_chunk_size, self.chunk_size))
+        self._executor = None
+        self._worker_stats = {}
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def split(self, leads: list) -> list:
+        """
+        Chunks of ``leads`` for the workers, in order.
+
+        A batch is spread evenly over the workers (at most ``chunk_size`` and
+        at least ``min_chunk_size`` leads per chunk), so a single page is
+        already cleaned in parallel.
+        """
+        per_worker = -(-len(leads) // self.workers)
+        size = max(self.min_chunk_size, min(self.chunk_size, per_worker))
+        return [leads[i : i + size] for i in range(0, len(leads), size)]
+
+    async def clean(self, leads: list) -> list:
+        """Return the cleaned leads in input order without blocking the loop."""
+        if not leads:
+            return []
+        loop = asyncio.get_running_loop()
+        chunks = self.split(leads)
+        # one chunk or a single worker: a thread avoids the pickling overhead
+        if self.workers == 1 or len(chunks) == 1:
+            _, cleaned, _ = await loop.run_in_executor(None, clean_chunk, leads)
+            return cleaned
+
+        executor = self._get_executor()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(executor, clean_chunk, c) for c in chunks)
+        )
+        for pid, _, stats in results:
+            self._worker_stats[pid] = stats
+        return [lead for _, chunk, _ in results for lead in chunk]
+
+    def cache_stats(self) -> dict:
+        """Normalizer cache counters summed over this process and the workers."""
+        total = cache_stats()
+        for stats in self._worker_stats.values():
+            for name, counters in stats.items():
+                for key in ("hits", "misses", "size"):
+                    total[name][key] += counters[key]
+        return total
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+            self._worker_stats = {}
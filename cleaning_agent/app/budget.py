@@ -0,0 +1,104 @@
+"""Single-pass budget tokenizer.
+
+One precompiled regex walks a raw budget string once and picks up the amount,
+the ``k`` multiplier and the currency markers together, instead of separate
+``re.search``/``re.findall`` calls and substring scans.
+"""
+
+import json
+import os
+import re
+from typing import Dict, NamedTuple, Optional
+
+# EUR conversion rates; earlier entries win when several currencies appear.
+DEFAULT_CURRENCY_RATES = {"eur": 1.0, "usd": 0.92, "gbp": 1.15}
+DEFAULT_CURRENCY_SYMBOLS = {"€": "eur", "$": "usd", "£": "gbp"}
+
+# Markers that mean "no budget given".
+UNKNOWN_MARKERS = ("tbd", "unknown")
+
+
+def load_currency_rates() -> Dict[str, float]:
+    """Rates from the ``CURRENCY_RATES`` env var (JSON object), else the defaults."""
+    raw = os.getenv("CURRENCY_RATES")
+    if not raw:
+        return dict(DEFAULT_CURRENCY_RATES)
+    return {code.lower(): float(rate) for code, rate in json.loads(raw).items()}
+
+
+class BudgetToken(NamedTuple):
+    amount: float
+    multiplier: int
+    currency: Optional[str]
+
+
+class BudgetParser:
+    """Parse rough budget strings such as ``"$25k"`` or ``"24,000 eur"`` to euros."""
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, float]] = None,
+        symbols: Optional[Dict[str, str]] = None,
+    ):
+        rates = DEFAULT_CURRENCY_RATES if rates is None else rates
+        symbols = DEFAULT_CURRENCY_SYMBOLS if symbols is None else symbols
+        self.rates = {code.lower(): rate for code, rate in rates.items()}
+        self.symbols = {
+            sym.lower(): code.lower()
+            for sym, code in symbols.items()
+            if code.lower() in self.rates
+        }
+        self._priority = {code: i for i, code in enumerate(self.rates)}
+        markers = sorted(
+            [*self.rates, *self.symbols, *UNKNOWN_MARKERS], key=len, reverse=True
+        )
+        self._pattern = re.compile(
+            r"(?P<num>[\d,.]*\d[\d,.]*)(?P<k>\s*k)?|"
+            + "(?P<word>"
+            + "|".join(map(re.escape, markers))
+            + ")"
+        )
+
+    def tokenize(self, budget_str: str) -> Optional[BudgetToken]:
+        """
+        Extract amount, multiplier and currency in one pass over the string.
+
+        The amount is the first number; ``k`` after any number multiplies it by
+        1000. Returns None for empty/unknown budgets or when no valid number occurs.
+        """
+        if not budget_str:
+            return None
+        s = budget_str.lower().strip()
+
+        amount = None
+        multiplier = 1
+        currency = None
+        for m in self._pattern.finditer(s):
+            num = m.group("num")
+            if num is not None:
+                if amount is None:
+                    amount = num
+                if m.group("k"):
+                    multiplier = 1000
+                continue
+            word = m.group("word")
+            if word in UNKNOWN_MARKERS:
+                return None
+            code = self.symbols.get(word, word)
+            if currency is None or self._priority[code] < self._priority[currency]:
+                currency = code
+
+        if amount is None:
+            return None
+        try:
+            value = float(amount.replace(",", ""))
+        except ValueError:  # e.g. "1.2.3"
+            return None
+        return BudgetToken(value, multiplier, currency)
+
+    def to_euro(self, budget_str: str) -> Optional[float]:
+        token = self.tokenize(budget_str)
+        if token is None:
+            return None
+        rate = self.rates[token.currency] if token.currency else 1
+        return round(token.amount * token.multiplier * rate, 2)
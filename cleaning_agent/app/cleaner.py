@@ -1,10 +1,17 @@
+import os
 import re
-from datetime import datetime
+from functools import lru_cache
 
 import phonenumbers
-from dateutil import parser
 from rapidfuzz import process
 
+from .budget import BudgetParser, load_currency_rates
+from .dates import DateNormalizer
+from .region_matcher import RegionMatcher
+
+# Raw values repeat heavily across purchased lists; memoize the normalizers.
+NORMALIZER_CACHE_SIZE = int(os.getenv("NORMALIZER_CACHE_SIZE", "8192"))
+
 CANONICAL_REGIONS = {
     "dach": ["germany", "austria", "switzerland", "dach"],
     "uki": ["uk", "united kingdom", "ireland", "london"],
@@ -12,6 +19,25 @@ CANONICAL_REGIONS = {
     "north america": ["usa", "us", "canada", "na", "north america"],
 }
 
+# rates can be overridden with the CURRENCY_RATES env var (JSON object)
+BUDGET_PARSER = BudgetParser(load_currency_rates())
+
+# strict formats first, dateutil (dayfirst) for the rest
+DATE_NORMALIZER = DateNormalizer()
+
+# compiled once; priority follows the dict order above
+REGION_MATCHER = RegionMatcher(CANONICAL_REGIONS)
+
+# phonenumbers country per canonical region, tried for numbers written without
+# an international prefix that are not valid in DEFAULT_PHONE_REGION
+PHONE_REGION_HINTS = {"dach": "DE", "uki": "GB", "north america": "US"}
+DEFAULT_PHONE_REGION = os.getenv("DEFAULT_PHONE_REGION", "NL")
+
+# formatting that phonenumbers ignores; stripped to build the cache key
+_PHONE_SEPARATORS = re.compile(r"[\s\-.()/]")
+# "+31..." or "0031...": 00 is the international prefix in most of the world
+_COUNTRY_CODE = re.compile(r"(\+|00)(?=[1-9])")
+
 CANONICAL_INDUSTRIES = [
     "saas",
     "fintech",
@@ -26,54 +52,60 @@ CANONICAL_INDUSTRIES = [
 ]
 
 
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
 def normalize_budget(budget_str: str):
     """Extract numeric amount and convert to euros (rough)."""
-    if not budget_str:
-        return None
-    s = budget_str.lower().strip()
-    if any(x in s for x in ["tbd", "unknown"]):
-        return None
+    return BUDGET_PARSER.to_euro(budget_str)
 
-    # handle 'k' or 'K' suffix for thousands
-    multiplier = 1
-    if re.search(r"\d+(\.\d+)?\s*k", s):
-        multiplier = 1000
 
-    match = re.findall(r"[\d,.]+", s)
-    if not match:
-        return None
-
-    amount = float(match[0].replace(",", "")) * multiplier
-
-    # currency handling
-    if "€" in s or "eur" in s:
-        rate = 1
-    elif "$" in s or "usd" in s:
-        rate = 0.92
-    elif "£" in s or "gbp" in s:
-        rate = 1.15
-    else:
-        rate = 1
-    return round(amount * rate, 2)
+def normalize_budgets(budgets: list):
+    """Vectorized ``normalize_budget``: each distinct raw value is parsed once."""
+    parsed = {raw: normalize_budget(raw) for raw in dict.fromkeys(budgets)}
+    return [parsed[raw] for raw in budgets]
 
 
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
 def normalize_date(date_str: str):
     """Parse date string to ISO format."""
-    if not date_str:
-        return None
-    try:
-        dt = parser.parse(date_str, dayfirst=True)
-        return dt.isoformat()
-    except Exception:
-        return None
+    return DATE_NORMALIZER.to_iso(date_str)
+
 
+def normalize_dates(dates: list):
+    """
+    Vectorized ``normalize_date``.
 
-def normalize_phone(phone_str: str, default_region="NL"):
-    """Normalize phone number to E.164 format."""
+    The date formats are first reordered to match a sample of the batch, then
+    each distinct raw value is parsed once.
+    """
+    distinct = list(dict.fromkeys(dates))
+    DATE_NORMALIZER.sniff(distinct)
+    parsed = {raw: normalize_date(raw) for raw in distinct}
+    return [parsed[raw] for raw in dates]
+
+
+def normalize_phone(phone_str: str, region_hint=None):
+    """
+    Normalize phone number to E.164 format.
+
+    Numbers without a country code are read in ``DEFAULT_PHONE_REGION`` and,
+    if they are not valid there, in ``region_hint`` (a phonenumbers country).
+    """
     if not phone_str:
         return None
+    key = _PHONE_SEPARATORS.sub("", phone_str)
+    if _COUNTRY_CODE.match(key):
+        return normalize_phone_key(_COUNTRY_CODE.sub("+", key, count=1), None)
+    phone = normalize_phone_key(key, DEFAULT_PHONE_REGION)
+    if phone is None and region_hint and region_hint != DEFAULT_PHONE_REGION:
+        phone = normalize_phone_key(key, region_hint)
+    return phone
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def normalize_phone_key(key: str, region):
+    """Parse and validate a separator-stripped phone number."""
     try:
-        p = phonenumbers.parse(phone_str, default_region)
+        p = phonenumbers.parse(key, region)
         if phonenumbers.is_valid_number(p):
             return phonenumbers.format_number(p, phonenumbers.PhoneNumberFormat.E164)
     except Exception:
@@ -81,17 +113,30 @@ def normalize_phone(phone_str: str, default_region="NL"):
     return None
 
 
+def phone_region(region: str):
+    """Fallback phone country for a canonical region (None if it has none)."""
+    return PHONE_REGION_HINTS.get(region)
+
+
+def normalize_phones(phones: list, regions: list):
+    """
+    Vectorized ``normalize_phone``.
+
+    ``regions`` are the leads' canonical regions; each picks the country tried
+    for national-format numbers that are not valid in DEFAULT_PHONE_REGION.
+    """
+    return [normalize_phone(p, phone_region(r)) for p, r in zip(phones, regions)]
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
 def canonical_region(region_raw: str):
     """Map raw region to canonical region."""
     if not region_raw:
         return None
-    text = region_raw.lower()
-    for canon, variants in CANONICAL_REGIONS.items():
-        if any(v in text for v in variants):
-            return canon
-    return "other"
+    return REGION_MATCHER.match(region_raw.lower()) or "other"
 
 
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
 def canonical_industry(industry_raw: str):
     """Map raw industry to canonical using fuzzy matching."""
     if not industry_raw:
@@ -100,15 +145,64 @@ def canonical_industry(industry_raw: str):
     return match if score > 80 else "other"
 
 
+def canonical_industries(industries_raw: list):
+    """
+    Map a column of raw industries to canonical names.
+
+    Each distinct value (case-insensitive) is matched once through the
+    memoized ``canonical_industry``, so results are reused across batches.
+    """
+    keys = [raw.lower() if raw else None for raw in industries_raw]
+    mapping = {key: canonical_industry(key) for key in dict.fromkeys(keys)}
+    return [mapping[k] for k in keys]
+
+
+CACHED_NORMALIZERS = [
+    normalize_budget,
+    normalize_date,
+    normalize_phone_key,
+    canonical_region,
+    canonical_industry,
+]
+
+
+def cache_stats():
+    """Hit/miss counters of the memoized normalizers in this process."""
+    stats = {}
+    for fn in CACHED_NORMALIZERS:
+        info = fn.cache_info()
+        stats[fn.__name__] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
 def clean_lead(lead: dict):
     """Return normalized fields merged onto the raw lead."""
-    cleaned = lead.copy()
-    cleaned["email"] = lead["email"].strip().lower()
-    cleaned["rough_budget_normalized_euro"] = normalize_budget(
-        lead.get("rough_budget_raw")
-    )
-    cleaned["first_contacted_at"] = normalize_date(lead.get("first_contacted_raw"))
-    cleaned["phone"] = normalize_phone(lead.get("phone"))
-    cleaned["region"] = canonical_region(lead.get("region"))
-    cleaned["industry_raw"] = canonical_industry(lead.get("industry_raw"))
-    return cleaned
+    return clean_leads([lead])[0]
+
+
+def clean_leads(leads: list):
+    """Clean a batch of leads; the normalized fields are computed column-wise."""
+    budgets = normalize_budgets([lead.get("rough_budget_raw") for lead in leads])
+    dates = normalize_dates([lead.get("first_contacted_raw") for lead in leads])
+    industries = canonical_industries([lead.get("industry_raw") for lead in leads])
+    regions = [canonical_region(lead.get("region")) for lead in leads]
+    phones = normalize_phones([lead.get("phone") for lead in leads], regions)
+
+    results = []
+    for lead, budget, contacted_at, phone, region, industry in zip(
+        leads, budgets, dates, phones, regions, industries
+    ):
+        cleaned = lead.copy()
+        cleaned["email"] = lead["email"].strip().lower()
+        cleaned["rough_budget_normalized_euro"] = budget
+        cleaned["first_contacted_at"] = contacted_at
+        cleaned["phone"] = phone
+        cleaned["region"] = region
+        cleaned["industry_raw"] = industry
+        results.append(cleaned)
+    return results
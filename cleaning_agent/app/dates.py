@@ -0,0 +1,173 @@
+"""Fast-path date parsing.
+
+A handful of strict, precompiled formats (ISO, ``DD-MM-YYYY``, ``Mon DD YYYY``
+...) cover most raw contact dates; they are tried first and built into a
+``datetime`` directly. Anything they do not match, or that is not a valid
+date in that format, goes to ``dateutil.parser.parse(dayfirst=True)``.
+"""
+
+import re
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, List, NamedTuple, Optional, Pattern
+
+from dateutil import parser
+
+# month names as dateutil accepts them
+MONTHS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+_MONTH = "(?P<month>" + "|".join(sorted(MONTHS, key=len, reverse=True)) + r")\.?"
+
+# values looked at when sniffing the formats of a batch
+SNIFF_SAMPLE = 64
+
+
+def _tz(match) -> Optional[timezone]:
+    tz = match.group("tz")
+    if not tz:
+        return None
+    if tz in ("Z", "z"):
+        return timezone.utc
+    sign = -1 if tz[0] == "-" else 1
+    hours, minutes = int(tz[1:3]), int(tz[-2:])
+    return timezone(sign * timedelta(hours=hours, minutes=minutes))
+
+
+def _iso(m) -> datetime:
+    fraction = m.group("fraction") or ""
+    return datetime(
+        int(m.group("year")),
+        int(m.group("month")),
+        int(m.group("day")),
+        int(m.group("hour") or 0),
+        int(m.group("minute") or 0),
+        int(m.group("second") or 0),
+        int(fraction.ljust(6, "0")) if fraction else 0,
+        tzinfo=_tz(m),
+    )
+
+
+def _numeric(m) -> datetime:
+    return datetime(int(m.group("year")), int(m.group("month")), int(m.group("day")))
+
+
+def _named(m) -> datetime:
+    month = MONTHS[m.group("month").lower()]
+    return datetime(int(m.group("year")), month, int(m.group("day")))
+
+
+class DateFormat(NamedTuple):
+    name: str
+    pattern: Pattern
+    build: Callable[[re.Match], datetime]
+
+
+DATE_FORMATS = [
+    DateFormat(
+        "iso",
+        re.compile(
+            r"(?P<year>[1-9]\d{3})-(?P<month>\d{2})-(?P<day>\d{2})"
+            r"(?:[T ](?P<hour>\d{2}):(?P<minute>\d{2})"
+            r"(?::(?P<second>\d{2})(?:\.(?P<fraction>\d{1,6}))?)?"
+            r"(?P<tz>[Zz]|[+-]\d{2}:?\d{2})?)?"
+        ),
+        _iso,
+    ),
+    # day first, like dateutil with dayfirst=True; an invalid day/month pair
+    # (e.g. 12-31-2025) falls back to dateutil, which swaps them
+    DateFormat(
+        "dd-mm-yyyy",
+        re.compile(
+            r"(?P<day>\d{1,2})(?P<sep>[-/.])(?P<month>\d{1,2})(?P=sep)(?P<year>[1-9]\d{3})"
+        ),
+        _numeric,
+    ),
+    DateFormat(
+        "mon dd yyyy",
+        re.compile(
+            _MONTH + r"\s+(?P<day>\d{1,2}),?\s+(?P<year>[1-9]\d{3})", re.IGNORECASE
+        ),
+        _named,
+    ),
+    DateFormat(
+        "dd mon yyyy",
+        re.compile(
+            r"(?P<day>\d{1,2})\s+" + _MONTH + r",?\s+(?P<year>[1-9]\d{3})",
+            re.IGNORECASE,
+        ),
+        _named,
+    ),
+]
+
+
+class DateNormalizer:
+    """
+    Parse raw dates to ISO strings, trying the strict formats before dateutil.
+
+    The formats are tried most common first; ``sniff`` reorders them for the
+    batch at hand and ``hits`` counts which path parsed each value.
+    """
+
+    def __init__(self, formats: Optional[List[DateFormat]] = None):
+        self.formats = list(DATE_FORMATS if formats is None else formats)
+        self.hits = Counter()
+
+    def sniff(self, values: Iterable[str]):
+        """Order the formats by how many of ``values`` (a sample) each matches."""
+        seen = Counter()
+        for i, value in enumerate(values):
+            if i >= SNIFF_SAMPLE:
+                break
+            if not value:
+                continue
+            text = value.strip()
+            for fmt in self.formats:
+                if fmt.pattern.fullmatch(text):
+                    seen[fmt.name] += 1
+                    break
+        # stable: unseen formats keep their relative order. A new list is bound
+        # rather than sorted in place so concurrent parses never see it empty.
+        self.formats = sorted(self.formats, key=lambda fmt: -seen[fmt.name])
+
+    def parse(self, date_str: str) -> Optional[datetime]:
+        if not date_str:
+            return None
+        text = date_str.strip()
+        for fmt in self.formats:
+            m = fmt.pattern.fullmatch(text)
+            if m is None:
+                continue
+            try:
+                dt = fmt.build(m)
+            except ValueError:  # e.g. 31-02-2025, or month/day swapped
+                break
+            self.hits[fmt.name] += 1
+            return dt
+        self.hits["dateutil"] += 1
+        try:
+            return parser.parse(date_str, dayfirst=True)
+        except Exception:
+            return None
+
+    def to_iso(self, date_str: str) -> Optional[str]:
+        dt = self.parse(date_str)
+        return dt.isoformat() if dt is not None else None
@@ -1,30 +1,84 @@
-import asyncio
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
 
-from app.cleaner import clean_lead
-from app.rest_client import fetch_raw_leads, post_cleaned_leads
-from fastapi import FastAPI, HTTPException
+import httpx
+from app import rest_client
+from app.batch import BatchCleaner
+from app.rest_client import LEADS_PAGE_SIZE, iter_raw_lead_pages, post_cleaned_leads
+from fastapi import Body, FastAPI, HTTPException
 
-app = FastAPI(title="Cleaning Agent", version="0.1.0")
+cleaner = BatchCleaner()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    cleaner.shutdown()
+    await rest_client.aclose()
+
+
+app = FastAPI(title="Cleaning Agent", version="0.1.0", lifespan=lifespan)
 
 
 @app.get("/health")
 async def health():
-    return {"status": "ok"}
+    return {"status": "ok", "normalizer_cache": cleaner.cache_stats()}
 
 
 @app.api_route("/clean-leads", methods=["GET", "POST"])
-async def clean_leads(limit: int = 100):
-    """Fetch raw leads, clean them, and post the cleaned leads."""
+async def clean_leads(
+    limit: Optional[int] = None,
+    page_size: int = LEADS_PAGE_SIZE,
+    mode: Literal["latest", "incremental"] = "latest",
+):
+    """
+    Fetch raw leads page by page, clean them, and post the cleaned leads.
+
+    The next page is downloaded while the current one is being cleaned.
+
+    - ``latest``: the newest ``limit`` (default 100) leads with status 'new'.
+    - ``incremental``: drain the backlog of leads never cleaned or changed since
+      their last write-back (all of it unless ``limit`` is given). Posting marks
+      them cleaned, so each change is processed once across runs.
+    """
+    if mode == "latest" and limit is None:
+        limit = 100
+    pages_iter = iter_raw_lead_pages(
+        limit=limit, page_size=page_size, pending=mode == "incremental"
+    )
+    fetched = cleaned_count = posted = rejected = stale = pages = 0
     try:
-        leads = await fetch_raw_leads(limit=limit)
-    except Exception as e:
+        async for leads in pages_iter:
+            pages += 1
+            fetched += len(leads)
+            cleaned = await cleaner.clean(leads)
+            cleaned_count += len(cleaned)
+            result = await post_cleaned_leads(cleaned)
+            posted += result["updated"]
+            rejected += result["rejected"]
+            stale += result["stale"]
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=502, detail=str(e))
 
-    cleaned = [clean_lead(l) for l in leads]
-    await post_cleaned_leads(cleaned)
-
     return {
-        "fetched": len(leads),
-        "cleaned": len(cleaned),
-        "posted": len(cleaned),
+        "fetched": fetched,
+        "cleaned": cleaned_count,
+        "posted": posted,
+        "rejected": rejected,
+        "stale": stale,
+        "pages": pages,
     }
+
+
+@app.post("/clean-batch")
+async def clean_batch(payload: dict = Body(...)):
+    """
+    Clean the leads in the body and return them, without touching Django.
+
+    Body: {"leads": [raw lead, ...]}; responds with {"leads": [cleaned lead, ...]}
+    in the same order. Used by the pipeline agent.
+    """
+    leads = payload.get("leads")
+    if not isinstance(leads, list):
+        raise HTTPException(status_code=400, detail="Expected a 'leads' list")
+    return {"leads": await cleaner.clean(leads)}
@@ -0,0 +1,78 @@
+"""Single-pass matcher for the region vocabulary.
+
+The aliases of every canonical region are compiled once into an Aho-Corasick
+automaton, so finding the canonical hit in a raw string costs one pass over
+the text however many aliases the vocabulary holds.
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+
+_NO_MATCH = -1
+
+
+class RegionMatcher:
+    """
+    Find the canonical region whose alias occurs in a text.
+
+    Like scanning ``vocabulary`` in order with ``any(v in text ...)``, the
+    earliest canonical region (dict order) that has any alias as a substring
+    wins, wherever in the text the aliases occur.
+    """
+
+    def __init__(self, vocabulary: Dict[str, List[str]]):
+        self._canonical = list(vocabulary)
+        goto: List[Dict[str, int]] = [{}]
+        # best (lowest) priority among the aliases ending at each node
+        best: List[int] = [_NO_MATCH]
+
+        for priority, aliases in enumerate(vocabulary.values()):
+            for alias in aliases:
+                node = 0
+                for ch in alias:
+                    nxt = goto[node].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[node][ch] = nxt
+                        goto.append({})
+                        best.append(_NO_MATCH)
+                    node = nxt
+                if best[node] == _NO_MATCH or priority < best[node]:
+                    best[node] = priority
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                # a node also matches every alias that is a suffix of its path
+                inherited = best[fail[child]]
+                if inherited != _NO_MATCH and (
+                    best[child] == _NO_MATCH or inherited < best[child]
+                ):
+                    best[child] = inherited
+                queue.append(child)
+
+        self._goto = goto
+        self._fail = fail
+        self._best = best
+
+    def match(self, text: str) -> Optional[str]:
+        """Return the canonical region for ``text``, or None if no alias occurs."""
+        goto, fail, best = self._goto, self._fail, self._best
+        found = best[0]  # an empty alias matches any text
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            priority = best[state]
+            if priority != _NO_MATCH and (found == _NO_MATCH or priority < found):
+                found = priority
+                if found == 0:
+                    break
+        return None if found == _NO_MATCH else self._canonical[found]
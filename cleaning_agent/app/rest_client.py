@@ -1,23 +1,111 @@
+import asyncio
+import json
 import os
+from typing import AsyncIterator, List, Optional
 
 import httpx
 
 DJANGO_BASE = os.getenv("DJANGO_API_BASE", "http://django:8000")
+LEADS_TO_CLEAN_PATH = "/api/leads/to-clean/"
+# leads never cleaned or changed since their last write-back
+PENDING_LEADS_PATH = "/api/leads/to-clean/pending/"
+LEADS_PAGE_SIZE = int(os.getenv("LEADS_PAGE_SIZE", "500"))
+CLEANED_LEADS_PATH = "/api/leads/cleaned/"
+CLEANED_POST_CHUNK_SIZE = int(os.getenv("CLEANED_POST_CHUNK_SIZE", "1000"))
 TIMEOUT = 10.0
 
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Shared pooled client for all calls to Django, created on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(base_url=DJANGO_BASE, timeout=TIMEOUT)
+    return _client
+
+
+async def aclose():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _get_page(path: str, params: dict) -> dict:
+    r = await get_client().get(path, params=params)
+    r.raise_for_status()
+    return r.json()
+
+
+async def iter_raw_lead_pages(
+    limit: Optional[int] = None,
+    page_size: int = LEADS_PAGE_SIZE,
+    pending: bool = False,
+) -> AsyncIterator[List[dict]]:
+    """
+    Yield pages of raw leads from Django, following the keyset cursor.
+
+    The next page is requested before the current one is yielded, so fetching
+    it overlaps with whatever the caller does with the current page. Stops
+    after ``limit`` leads when given. With ``pending`` the pages come from the
+    cleaning backlog (oldest change first) instead of the newest 'new' leads.
+    """
+    path = PENDING_LEADS_PATH if pending else LEADS_TO_CLEAN_PATH
+
+    def request(cursor=None):
+        size = page_size if limit is None else min(page_size, limit - fetched)
+        params = {"limit": size}
+        if cursor:
+            params["cursor"] = cursor
+        return asyncio.create_task(_get_page(path, params))
+
+    fetched = 0
+    next_page = request() if limit is None or limit > 0 else None
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = None
+            results = page["results"]
+            fetched += len(results)
+            if page.get("next") and (limit is None or fetched < limit):
+                next_page = request(httpx.URL(page["next"]).params.get("cursor"))
+            if results:
+                yield results
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
 
 async def fetch_raw_leads(limit: int = 100):
-    """GET raw leads from Django."""
-    url = f"{DJANGO_BASE}/api/leads/to-clean/?limit={limit}"
-    async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-        r = await client.get(url)
-        r.raise_for_status()
-        return r.json()
+    """GET up to ``limit`` raw leads from Django."""
+    leads = []
+    async for page in iter_raw_lead_pages(limit=limit):
+        leads.extend(page)
+    return leads
+
 
+async def post_cleaned_leads(cleaned: list, chunk_size: int = CLEANED_POST_CHUNK_SIZE):
+    """
+    Write cleaned leads back to Django in chunks of ``chunk_size``.
 
-async def post_cleaned_leads(cleaned: list):
-    """Stub: will later POST to second agent."""
-    # url = os.getenv("SECOND_AGENT_URL")
-    # async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-    #     await client.post(url, json=cleaned)
-    print(f"[DEBUG] Would post {len(cleaned)} cleaned leads")
+    Each chunk is sent as one NDJSON body, which Django applies with
+    ``bulk_update``. Returns the summed ``{"updated", "rejected", "stale"}``
+    counts.
+    """
+    totals = {"updated": 0, "rejected": 0, "stale": 0}
+    for start in range(0, len(cleaned), chunk_size):
+        body = "".join(
+            json.dumps(lead, default=str) + "\n"
+            for lead in cleaned[start : start + chunk_size]
+        )
+        r = await get_client().post(
+            CLEANED_LEADS_PATH,
+            content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        r.raise_for_status()
+        result = r.json()
+        for key in totals:
+            totals[key] += result.get(key, 0)
+    return totals
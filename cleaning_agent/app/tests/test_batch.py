@@ -0,0 +1,61 @@
+import asyncio
+
+from app.batch import BatchCleaner
+from app.cleaner import clean_lead
+
+
+def _raw(i):
+    return {
+        "id": i,
+        "email": f"LEAD{i}@TEST.COM",
+        "rough_budget_raw": f"${i}k",
+        "first_contacted_raw": "14-07-2025",
+        "phone": "+31 6 12 34 56 78",
+        "region": "Germany",
+        "industry_raw": "fintech",
+    }
+
+
+def test_batch_cleaner_keeps_order_across_workers():
+    leads = [_raw(i) for i in range(1, 12)]
+    cleaner = BatchCleaner(workers=2, chunk_size=3)
+    try:
+        cleaned = asyncio.run(cleaner.clean(leads))
+    finally:
+        cleaner.shutdown()
+    assert [l["id"] for l in cleaned] == list(range(1, 12))
+    assert cleaned == [clean_lead(l) for l in leads]
+
+
+def test_batch_cleaner_small_batch_and_empty():
+    cleaner = BatchCleaner(workers=4, chunk_size=100)
+    assert asyncio.run(cleaner.clean([])) == []
+    cleaned = asyncio.run(cleaner.clean([_raw(1)]))
+    assert cleaned[0]["email"] == "lead1@test.com"
+    assert cleaner._executor is None
+
+
+def test_batch_cleaner_reports_worker_cache_stats():
+    cleaner = BatchCleaner(workers=2, chunk_size=2)
+    try:
+        asyncio.run(cleaner.clean([_raw(1) for _ in range(8)]))
+        stats = cleaner.cache_stats()
+    finally:
+        cleaner.shutdown()
+    assert stats["normalize_budget"]["hits"] + stats["normalize_budget"]["misses"] >= 8
+
+
+def test_batch_cleaner_spreads_a_page_over_the_workers():
+    cleaner = BatchCleaner(workers=4, chunk_size=500, min_chunk_size=100)
+    assert [len(c) for c in cleaner.split(list(range(500)))] == [125] * 4
+    assert [len(c) for c in cleaner.split(list(range(150)))] == [100, 50]
+    assert len(cleaner.split(list(range(80)))) == 1
+    assert [len(c) for c in cleaner.split(list(range(4000)))] == [500] * 8
+
+    leads = [_raw(i) for i in range(1, 201)]
+    try:
+        cleaned = asyncio.run(cleaner.clean(leads))
+        assert cleaner._executor is not None
+    finally:
+        cleaner.shutdown()
+    assert [l["id"] for l in cleaned] == list(range(1, 201))
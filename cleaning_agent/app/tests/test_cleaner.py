@@ -1,12 +1,20 @@
 import pytest
+from app.budget import BudgetParser
 from app.cleaner import (
+    cache_stats,
+    canonical_industries,
     canonical_industry,
     canonical_region,
     clean_lead,
+    clean_leads,
     normalize_budget,
+    normalize_budgets,
     normalize_date,
+    normalize_dates,
     normalize_phone,
+    normalize_phones,
 )
+from app.dates import DateNormalizer
 
 
 def test_normalize_budget_basic():
@@ -16,6 +24,28 @@ def test_normalize_budget_basic():
     assert normalize_budget("unknown") is None
 
 
+def test_normalize_budget_single_pass_tokens():
+    assert normalize_budget("£10 k per year") == 11500
+    assert normalize_budget("approx. 12.5k usd") == 11500
+    assert normalize_budget("between 10-20k €") == 10000
+    assert normalize_budget("TBD, maybe $5k") is None
+    assert normalize_budget("n/a") is None
+    assert normalize_budgets(["€24000", None, "$25k", "€24000"]) == [
+        24000,
+        None,
+        23000,
+        24000,
+    ]
+
+
+def test_budget_parser_configurable_rates():
+    parser = BudgetParser(rates={"eur": 1.0, "chf": 1.05}, symbols={"fr.": "chf"})
+    assert parser.to_euro("20k CHF") == 21000
+    assert parser.to_euro("$100") == 100  # unknown currency falls back to 1:1
+    token = parser.tokenize("1,5k eur")
+    assert (token.amount, token.multiplier, token.currency) == (15.0, 1000, "eur")
+
+
 def test_normalize_date_formats():
     assert normalize_date("2025-07-14").startswith("2025-07-14")
     assert normalize_date("14-07-2025").startswith("2025-07-14")
@@ -23,18 +53,90 @@ def test_normalize_date_formats():
     assert normalize_date(None) is None
 
 
+def test_date_normalizer_fast_path_and_fallback():
+    normalizer = DateNormalizer()
+    assert normalizer.to_iso("2025-07-04") == "2025-07-04T00:00:00"
+    assert normalizer.to_iso("4/7/2025") == "2025-07-04T00:00:00"
+    assert normalizer.to_iso("14 July, 2025") == "2025-07-14T00:00:00"
+    assert normalizer.to_iso("2025-07-14T10:30Z") == "2025-07-14T10:30:00+00:00"
+    # not day-first valid: dateutil swaps day and month
+    assert normalizer.to_iso("12-31-2025") == "2025-12-31T00:00:00"
+    assert normalizer.to_iso("Feb 30 2025") is None
+    assert normalizer.hits["dateutil"] == 2
+
+    normalizer.sniff(["Jul 14 2025", "Aug 1 2025", "2025-07-14"])
+    assert normalizer.formats[0].name == "mon dd yyyy"
+    assert normalize_dates(["14-07-2025", None, "14-07-2025"]) == [
+        "2025-07-14T00:00:00",
+        None,
+        "2025-07-14T00:00:00",
+    ]
+
+
 def test_normalize_phone():
     p = normalize_phone("+31 6 12 34 56 78")
     assert p.startswith("+31")
     assert normalize_phone("invalid-number") is None
 
 
+def test_normalize_phones_uses_region_hints():
+    phones = ["020 7946 0958", "(212) 555-0188", "+31 6 12 34 56 78", None]
+    regions = ["uki", "north america", "uki", "dach"]
+    assert normalize_phones(phones, regions) == [
+        "+442079460958",
+        "+12125550188",
+        "+31612345678",
+        None,
+    ]
+    # without a hint the national UK number is read as Dutch and rejected
+    assert normalize_phone("020 7946 0958") is None
+
+    before = cache_stats()["normalize_phone_key"]
+    assert normalize_phone("+31-6-1234-5678") == normalize_phone("+31 6 1234 5678")
+    assert cache_stats()["normalize_phone_key"]["hits"] >= before["hits"] + 1
+
+
+def test_normalize_phones_international_prefix_and_default_region():
+    phones = ["0031 20 999 8888", "0044 20 7946 0958", "(020) 123-45-67"] * 2
+    regions = ["north america"] * 3 + ["dach"] * 3
+    # 00 is a country code prefix whatever the hint; numbers valid in the
+    # default region (NL) keep that reading even if the hint could parse them
+    assert (
+        normalize_phones(phones, regions)
+        == [
+            "+31209998888",
+            "+442079460958",
+            "+31201234567",
+        ]
+        * 2
+    )
+
+
 def test_canonical_region_and_industry():
     assert canonical_region("Germany") == "dach"
     assert canonical_region("Tokyo") == "other"
+    # dict order wins over position: "austria" (dach) also contains "us"
+    assert canonical_region("Austria / US") == "dach"
+    assert canonical_region("London, UK") == "uki"
     assert canonical_industry("finteh") == "fintech"
 
 
+def test_canonical_industries_matches_single_value_mapping():
+    raw = ["finteh", "FinTech", "Health Care", "saas", "bakery", "", None, "finteh"]
+    assert canonical_industries(raw) == [canonical_industry(v) for v in raw]
+    assert canonical_industries([]) == []
+
+
+def test_canonical_industries_reuses_the_industry_cache():
+    before = cache_stats()["canonical_industry"]
+    canonical_industries(["Telecoms", "telecoms", "TELECOMS"])
+    canonical_industries(["telecoms"])
+    after = cache_stats()["canonical_industry"]
+    # the batch matches the value once; the next batch is served from the cache
+    assert after["hits"] + after["misses"] == before["hits"] + before["misses"] + 2
+    assert after["hits"] >= before["hits"] + 1
+
+
 def test_clean_lead_integration():
     raw = {
         "email": "EXAMPLE@TEST.COM",
@@ -48,3 +150,13 @@ def test_clean_lead_integration():
     assert cleaned["email"] == "example@test.com"
     assert cleaned["region"] == "uki"
     assert cleaned["rough_budget_normalized_euro"] > 0
+    assert clean_leads([raw]) == [cleaned]
+
+
+def test_normalizers_are_memoized():
+    before = cache_stats()["canonical_region"]
+    assert canonical_region("Somewhere in Austria") == "dach"
+    assert canonical_region("Somewhere in Austria") == "dach"
+    after = cache_stats()["canonical_region"]
+    assert after["hits"] >= before["hits"] + 1
+    assert after["size"] <= after["maxsize"]
@@ -0,0 +1,63 @@
+import asyncio
+
+import httpx
+from app import rest_client
+
+LEADS = [{"id": i} for i in range(5, 0, -1)]
+
+
+def _handler(requests):
+    def handle(request):
+        requests.append(dict(request.url.params))
+        start = int(request.url.params.get("cursor", 0))
+        end = start + int(request.url.params["limit"])
+        nxt = None
+        if end < len(LEADS):
+            nxt = f"http://django:8000/api/leads/to-clean/?cursor={end}&limit=2"
+        return httpx.Response(200, json={"next": nxt, "results": LEADS[start:end]})
+
+    return handle
+
+
+def _collect(**kwargs):
+    async def run():
+        return [page async for page in rest_client.iter_raw_lead_pages(**kwargs)]
+
+    return asyncio.run(run())
+
+
+def test_iter_raw_lead_pages_follows_cursor(monkeypatch):
+    requests = []
+    client = httpx.AsyncClient(
+        base_url="http://django:8000", transport=httpx.MockTransport(_handler(requests))
+    )
+    monkeypatch.setattr(rest_client, "_client", client)
+
+    pages = _collect(page_size=2)
+    assert [[lead["id"] for lead in page] for page in pages] == [[5, 4], [3, 2], [1]]
+    assert [r.get("cursor") for r in requests] == [None, "2", "4"]
+
+    requests.clear()
+    pages = _collect(limit=3, page_size=2)
+    assert sum(len(page) for page in pages) == 3
+    assert [r["limit"] for r in requests] == ["2", "1"]
+
+
+def test_post_cleaned_leads_sends_ndjson_chunks(monkeypatch):
+    bodies = []
+
+    def handle(request):
+        lines = request.content.decode().splitlines()
+        bodies.append(lines)
+        assert request.headers["content-type"] == "application/x-ndjson"
+        return httpx.Response(200, json={"updated": len(lines), "rejected": 0})
+
+    client = httpx.AsyncClient(
+        base_url="http://django:8000", transport=httpx.MockTransport(handle)
+    )
+    monkeypatch.setattr(rest_client, "_client", client)
+
+    cleaned = [{"id": i, "region": "dach"} for i in range(5)]
+    result = asyncio.run(rest_client.post_cleaned_leads(cleaned, chunk_size=2))
+    assert result == {"updated": 5, "rejected": 0, "stale": 0}
+    assert [len(lines) for lines in bodies] == [2, 2, 1]
@@ -124,3 +124,9 @@ STATIC_URL = "static/"
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Rows written per transaction by /api/matches/ingest/
+MATCHES_INGEST_BATCH_SIZE = 1000
+
+# Leads updated per transaction by /api/leads/cleaned/
+LEADS_CLEANED_BATCH_SIZE = 1000
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("companies", "0001_initial"),
+        ("leads", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="lead",
+            options={"verbose_name": "Lead", "verbose_name_plural": "Leads"},
+        ),
+        migrations.AlterModelOptions(
+            name="leadcompanymatch",
+            options={
+                "verbose_name": "Lead-Company Match",
+                "verbose_name_plural": "Lead-Company matches",
+            },
+        ),
+        migrations.RemoveIndex(
+            model_name="leadcompanymatch",
+            name="leads_leadc_compati_239ca6_idx",
+        ),
+        migrations.AddIndex(
+            model_name="leadcompanymatch",
+            index=models.Index(
+                fields=["compatibility_score", "id"],
+                name="leads_leadc_compati_a91d79_idx",
+            ),
+        ),
+    ]
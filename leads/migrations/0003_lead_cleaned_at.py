@@ -0,0 +1,34 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0002_leadcompanymatch_score_id_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="lead",
+            name="cleaned_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the cleaning agent last wrote normalized fields back",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                condition=models.Q(
+                    ("cleaned_at__isnull", True),
+                    ("updated_at__gt", models.F("cleaned_at")),
+                    _connector="OR",
+                ),
+                fields=["updated_at", "id"],
+                name="lead_pending_cleaning_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
+from django.db.models import F, Q
 
 from companies.models import Company
 
+# Leads whose raw fields changed since they were last cleaned (or never were).
+PENDING_CLEANING = Q(cleaned_at__isnull=True) | Q(updated_at__gt=F("cleaned_at"))
+
 
 class Lead(models.Model):
     STATUS_CHOICES = [
@@ -79,12 +83,23 @@ class Lead(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True, help_text="Last modification timestamp"
     )
+    cleaned_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the cleaning agent last wrote normalized fields back",
+    )
 
     class Meta:
         indexes = [
             models.Index(fields=["email"]),
             models.Index(fields=["region"]),
             models.Index(fields=["status"]),
+            # partial index: only leads waiting to be cleaned, in keyset order
+            models.Index(
+                fields=["updated_at", "id"],
+                condition=PENDING_CLEANING,
+                name="lead_pending_cleaning_idx",
+            ),
         ]
         verbose_name = "Lead"
         verbose_name_plural = "Leads"
@@ -109,7 +124,8 @@ class LeadCompanyMatch(models.Model):
 
     class Meta:
         unique_together = ("lead", "company")
-        indexes = [models.Index(fields=["compatibility_score"])]
+        # (score, id) backs the keyset pagination of match listings
+        indexes = [models.Index(fields=["compatibility_score", "id"])]
         verbose_name = "Lead-Company Match"
         verbose_name_plural = "Lead-Company matches"
 
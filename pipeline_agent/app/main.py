@@ -0,0 +1,56 @@
+import os
+from contextlib import asynccontextmanager
+
+from app.pipeline import PIPELINE_POLL_SECONDS, Pipeline
+from app.stages import RemoteStages
+from fastapi import FastAPI
+
+PIPELINE_AUTOSTART = os.getenv("PIPELINE_AUTOSTART", "1") == "1"
+PIPELINE_MIN_SCORE = os.getenv("PIPELINE_MIN_SCORE")
+
+stages = RemoteStages(
+    min_score=float(PIPELINE_MIN_SCORE) if PIPELINE_MIN_SCORE else None
+)
+pipeline = Pipeline.from_stages(stages)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PIPELINE_AUTOSTART:
+        pipeline.start()
+    yield
+    await pipeline.stop()
+    await stages.aclose()
+
+
+app = FastAPI(title="Pipeline Agent", version="0.1.0", lifespan=lifespan)
+
+
+@app.get("/health")
+async def health():
+    return {"status": "ok", "running": pipeline.running}
+
+
+@app.get("/stats")
+async def stats():
+    """Per-stage batches, items, throughput, lag and queue depth."""
+    return pipeline.snapshot()
+
+
+@app.post("/start")
+async def start(poll_seconds: float = PIPELINE_POLL_SECONDS):
+    """Run clean → score → persist continuously, polling for new leads."""
+    return {"started": pipeline.start(poll_seconds), **pipeline.snapshot()}
+
+
+@app.post("/stop")
+async def stop():
+    return {"stopped": await pipeline.stop(), **pipeline.snapshot()}
+
+
+@app.post("/run-once")
+async def run_once():
+    """Process the current backlog once and return the stats."""
+    if pipeline.running:
+        return {"detail": "Pipeline is running continuously", **pipeline.snapshot()}
+    return await pipeline.drain()
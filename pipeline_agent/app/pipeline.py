@@ -0,0 +1,215 @@
+"""Streaming micro-batch pipeline.
+
+A source yields micro-batches of raw leads; each stage runs as its own task
+and hands batches to the next one through a bounded ``asyncio.Queue``. A slow
+stage therefore fills its input queue and blocks the stages before it
+(backpressure) instead of letting work pile up in memory, while faster stages
+keep working on the next batches in parallel.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "4"))
+PIPELINE_POLL_SECONDS = float(os.getenv("PIPELINE_POLL_SECONDS", "30"))
+
+Source = Callable[[], AsyncIterator[list]]
+StageFn = Callable[[Any], Awaitable[Any]]
+
+_DONE = object()
+
+
+@dataclass
+class Batch:
+    seq: int
+    size: int
+    payload: Any
+    # when the source emitted it; lag is measured from here
+    created: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class StageStats:
+    name: str
+    batches: int = 0
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    last_lag_seconds: Optional[float] = None
+    max_lag_seconds: float = 0.0
+    last_error: Optional[str] = None
+    queue: Optional[asyncio.Queue] = field(default=None, repr=False)
+
+    def record(self, batch: Batch, busy: float):
+        self.batches += 1
+        self.items += batch.size
+        self.busy_seconds += busy
+        lag = time.monotonic() - batch.created
+        self.last_lag_seconds = lag
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+    def as_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "errors": self.errors,
+            "items_per_second": (
+                round(self.items / self.busy_seconds, 1) if self.busy_seconds else None
+            ),
+            "busy_seconds": round(self.busy_seconds, 3),
+            "lag_seconds": (
+                round(self.last_lag_seconds, 3)
+                if self.last_lag_seconds is not None
+                else None
+            ),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "last_error": self.last_error,
+        }
+
+
+class Pipeline:
+    """
+    Run ``source`` through ``stages`` (``(name, async fn)`` pairs) in order.
+
+    Each stage receives the previous stage's output for one batch. A batch
+    whose stage raises is dropped and counted under that stage's ``errors``;
+    the pipeline keeps going.
+    """
+
+    def __init__(
+        self,
+        source: Source,
+        stages: List[Tuple[str, StageFn]],
+        queue_size: int = PIPELINE_QUEUE_SIZE,
+    ):
+        self.source = source
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.stats = {name: StageStats(name) for name, _ in stages}
+        self.source_stats = StageStats("source")
+        self.drains = 0
+        self.started_at: Optional[float] = None
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._drain_lock = asyncio.Lock()
+
+    @classmethod
+    def from_stages(cls, stages, queue_size: int = PIPELINE_QUEUE_SIZE):
+        """clean → score → persist over an object providing those coroutines."""
+        return cls(
+            stages.source,
+            [
+                ("clean", stages.clean),
+                ("score", stages.score),
+                ("persist", stages.persist),
+            ],
+            queue_size=queue_size,
+        )
+
+    async def _feed(self, out: asyncio.Queue):
+        stats = self.source_stats
+        try:
+            async for items in self.source():
+                if not items:
+                    continue
+                self._seq += 1
+                batch = Batch(self._seq, len(items), items)
+                stats.batches += 1
+                stats.items += batch.size
+                await out.put(batch)  # blocks while the first stage is behind
+        except Exception as e:
+            stats.errors += 1
+            stats.last_error = repr(e)
+        finally:
+            await out.put(_DONE)
+
+    async def _work(self, name: str, fn: StageFn, inp: asyncio.Queue, out):
+        stats = self.stats[name]
+        while True:
+            batch = await inp.get()
+            if batch is _DONE:
+                if out is not None:
+                    await out.put(_DONE)
+                return
+            started = time.monotonic()
+            try:
+                batch.payload = await fn(batch.payload)
+            except Exception as e:
+                stats.errors += 1
+                stats.last_error = repr(e)
+                continue
+            stats.record(batch, time.monotonic() - started)
+            if out is not None:
+                await out.put(batch)
+
+    async def drain(self) -> dict:
+        """Run the source to exhaustion and wait until every batch went through."""
+        async with self._drain_lock:
+            await self._drain()
+        return self.snapshot()
+
+    async def _drain(self):
+        queues = [asyncio.Queue(self.queue_size) for _ in self.stages]
+        for (name, _), queue in zip(self.stages, queues):
+            self.stats[name].queue = queue
+        workers = [
+            self._work(
+                name, fn, queues[i], queues[i + 1] if i + 1 < len(queues) else None
+            )
+            for i, (name, fn) in enumerate(self.stages)
+        ]
+        await asyncio.gather(self._feed(queues[0]), *workers)
+        self.drains += 1
+
+    async def run_forever(self, poll_seconds: float = PIPELINE_POLL_SECONDS):
+        """Drain, wait ``poll_seconds``, repeat."""
+        while True:
+            await self.drain()
+            await asyncio.sleep(poll_seconds)
+
+    def start(self, poll_seconds: float = PIPELINE_POLL_SECONDS) -> bool:
+        """Run continuously in a background task; False if already running."""
+        if self.running:
+            return False
+        self.started_at = time.monotonic()
+        self._task = asyncio.create_task(self.run_forever(poll_seconds))
+        return True
+
+    async def stop(self) -> bool:
+        """Cancel the background task; in-flight batches are abandoned."""
+        if not self.running:
+            return False
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        return True
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def snapshot(self) -> dict:
+        """Per-stage throughput, lag and queue depth."""
+        return {
+            "running": self.running,
+            "drains": self.drains,
+            "uptime_seconds": (
+                round(time.monotonic() - self.started_at, 3)
+                if self.started_at is not None and self.running
+                else None
+            ),
+            "source": {
+                "batches": self.source_stats.batches,
+                "items": self.source_stats.items,
+                "errors": self.source_stats.errors,
+                "last_error": self.source_stats.last_error,
+            },
+            "stages": {name: s.as_dict() for name, s in self.stats.items()},
+        }
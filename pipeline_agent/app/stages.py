@@ -0,0 +1,202 @@
+"""Stages of the clean → score → persist pipeline.
+
+``RemoteStages`` talks to Django and the two agents over HTTP, one pooled
+client per service. ``LocalStages`` imports the cleaning and scoring code and
+runs them in this process, for tests and local runs without the containers.
+"""
+
+import asyncio
+import json
+import os
+from typing import List, Optional
+
+import httpx
+
+DJANGO_API_BASE = os.getenv("DJANGO_API_BASE", "http://django:8000")
+CLEANING_AGENT_URL = os.getenv("CLEANING_AGENT_URL", "http://cleaning_agent:8080")
+SCORING_AGENT_URL = os.getenv("SCORING_AGENT_URL", "http://scoring_agent:8090")
+PENDING_LEADS_PATH = "/api/leads/to-clean/pending/"
+CLEANED_LEADS_PATH = "/api/leads/cleaned/"
+MATCHES_INGEST_PATH = "/api/matches/ingest/"
+PIPELINE_BATCH_SIZE = int(os.getenv("PIPELINE_BATCH_SIZE", "500"))
+PIPELINE_TOP_K = int(os.getenv("PIPELINE_TOP_K", "10"))
+TIMEOUT = float(os.getenv("PIPELINE_TIMEOUT_SECONDS", "60"))
+
+# cleaned lead field -> scoring agent LeadIn field
+SCORING_FIELDS = {
+    "id": "id",
+    "first_name": "first_name",
+    "last_name": "last_name",
+    "email": "email",
+    "job_title": "job_title",
+    "industry_raw": "industry",
+    "region": "region",
+    "interest_area": "interest_area",
+    "rough_budget_normalized_euro": "budget_normalized_euro",
+    "first_contacted_at": "first_contacted_at",
+    "source": "source",
+    "consent_given": "consent_given",
+    "status": "status",
+}
+
+
+def to_scoring_lead(cleaned: dict) -> dict:
+    """Rename a cleaned Django lead to the scoring agent's ``LeadIn`` fields."""
+    return {dst: cleaned.get(src) for src, dst in SCORING_FIELDS.items()}
+
+
+def flatten_scores(results: list) -> List[dict]:
+    """``/score`` results -> rows for ``/api/matches/ingest/``."""
+    return [
+        {
+            "lead_id": item["lead_id"],
+            "company_id": sc["company_id"],
+            "compatibility_score": sc["score"],
+        }
+        for item in results
+        for sc in item["scores"]
+    ]
+
+
+class RemoteStages:
+    """Pipeline source and stages backed by the Django API and the agents."""
+
+    def __init__(
+        self,
+        batch_size: int = PIPELINE_BATCH_SIZE,
+        top_k: Optional[int] = PIPELINE_TOP_K,
+        min_score: Optional[float] = None,
+    ):
+        self.batch_size = batch_size
+        self.top_k = top_k
+        self.min_score = min_score
+        self._django = httpx.AsyncClient(base_url=DJANGO_API_BASE, timeout=TIMEOUT)
+        self._cleaning = httpx.AsyncClient(base_url=CLEANING_AGENT_URL, timeout=TIMEOUT)
+        self._scoring = httpx.AsyncClient(base_url=SCORING_AGENT_URL, timeout=TIMEOUT)
+
+    async def aclose(self):
+        await asyncio.gather(
+            self._django.aclose(), self._cleaning.aclose(), self._scoring.aclose()
+        )
+
+    async def source(self):
+        """Pages of leads waiting to be cleaned, following Django's cursor."""
+        params = {"limit": self.batch_size}
+        while True:
+            r = await self._django.get(PENDING_LEADS_PATH, params=params)
+            r.raise_for_status()
+            page = r.json()
+            yield page["results"]
+            if not page.get("next"):
+                return
+            params["cursor"] = httpx.URL(page["next"]).params["cursor"]
+
+    async def clean(self, leads: list) -> list:
+        r = await self._cleaning.post("/clean-batch", json={"leads": leads})
+        r.raise_for_status()
+        return r.json()["leads"]
+
+    async def score(self, cleaned: list) -> dict:
+        body = {
+            "leads": [to_scoring_lead(lead) for lead in cleaned],
+            "top_k": self.top_k,
+            "min_score": self.min_score,
+        }
+        r = await self._scoring.post("/score", json=body)
+        r.raise_for_status()
+        return {"cleaned": cleaned, "matches": flatten_scores(r.json()["results"])}
+
+    async def persist(self, scored: dict) -> dict:
+        """
+        Save the matches, then write the cleaned fields back.
+
+        The write-back marks the leads as cleaned, so it goes last: if saving
+        the matches fails the leads stay pending and are retried.
+        """
+        out = {"matches": 0, "leads": 0}
+        if scored["matches"]:
+            r = await self._django.post(
+                MATCHES_INGEST_PATH, json={"matches": scored["matches"]}
+            )
+            r.raise_for_status()
+            result = r.json()
+            out["matches"] = result["created"] + result["updated"]
+        body = "".join(
+            json.dumps(lead, default=str) + "\n" for lead in scored["cleaned"]
+        )
+        r = await self._django.post(
+            CLEANED_LEADS_PATH,
+            content=body.encode(),
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        r.raise_for_status()
+        out["leads"] = r.json()["updated"]
+        return out
+
+
+class LocalStages:
+    """
+    The same stages run in-process against ``cleaning_agent`` and
+    ``scoring_agent`` code (the repository root must be importable).
+
+    Scoring uses the scoring agent's in-process store and model, so companies
+    must be ingested and the model trained first. Persisted batches are kept
+    in ``self.cleaned`` and ``self.matches``.
+    """
+
+    def __init__(
+        self,
+        leads: list,
+        batch_size: int = PIPELINE_BATCH_SIZE,
+        top_k: Optional[int] = PIPELINE_TOP_K,
+        min_score: Optional[float] = None,
+    ):
+        from cleaning_agent.app.cleaner import clean_leads
+        from scoring_agent.app.engine import iter_score_chunks, rank_companies
+        from scoring_agent.app.schemas import LeadIn
+        from scoring_agent.app.storage import store
+
+        self._clean_leads = clean_leads
+        self._iter_score_chunks = iter_score_chunks
+        self._rank_companies = rank_companies
+        self._lead_model = LeadIn
+        self._store = store
+        self.leads = leads
+        self.batch_size = batch_size
+        self.top_k = top_k
+        self.min_score = min_score
+        self.cleaned: List[dict] = []
+        self.matches: List[dict] = []
+
+    async def aclose(self):
+        pass
+
+    async def source(self):
+        for start in range(0, len(self.leads), self.batch_size):
+            yield self.leads[start : start + self.batch_size]
+
+    async def clean(self, leads: list) -> list:
+        return await asyncio.to_thread(self._clean_leads, leads)
+
+    def _score(self, cleaned: list) -> List[dict]:
+        leads = [self._lead_model(**to_scoring_lead(lead)) for lead in cleaned]
+        companies = self._store.company_matrix()
+        if not len(companies):
+            raise ValueError("No companies ingested")
+        results = []
+        for start, probs in self._iter_score_chunks(leads, companies):
+            for offset, row in enumerate(probs):
+                scores = self._rank_companies(
+                    row, companies, self.top_k, self.min_score
+                )
+                results.append({"lead_id": leads[start + offset].id, "scores": scores})
+        return flatten_scores(results)
+
+    async def score(self, cleaned: list) -> dict:
+        matches = await asyncio.to_thread(self._score, cleaned)
+        return {"cleaned": cleaned, "matches": matches}
+
+    async def persist(self, scored: dict) -> dict:
+        self.cleaned.extend(scored["cleaned"])
+        self.matches.extend(scored["matches"])
+        return {"matches": len(scored["matches"]), "leads": len(scored["cleaned"])}
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+from app.pipeline import Pipeline
+
+
+def _source(n_batches, size=3):
+    async def source():
+        for b in range(n_batches):
+            yield list(range(b * size, (b + 1) * size))
+
+    return source
+
+
+def test_pipeline_runs_stages_in_order_with_bounded_queues():
+    seen = []
+    max_queued = []
+
+    async def double(items):
+        return [i * 2 for i in items]
+
+    async def slow_sink(items):
+        max_queued.append(pipeline.stats["sink"].queue.qsize())
+        await asyncio.sleep(0.001)
+        seen.extend(items)
+        return items
+
+    pipeline = Pipeline(
+        _source(10), [("double", double), ("sink", slow_sink)], queue_size=2
+    )
+    stats = asyncio.run(pipeline.drain())
+
+    assert seen == [i * 2 for i in range(30)]
+    assert max(max_queued) <= 2
+    assert stats["source"]["items"] == 30
+    assert stats["stages"]["sink"]["batches"] == 10
+    assert stats["stages"]["sink"]["lag_seconds"] is not None
+    assert stats["drains"] == 1
+
+
+def test_pipeline_drops_failed_batches_and_keeps_going():
+    async def flaky(items):
+        if items[0] == 3:
+            raise ValueError("boom")
+        return items
+
+    pipeline = Pipeline(_source(3), [("flaky", flaky)])
+    stats = asyncio.run(pipeline.drain())["stages"]["flaky"]
+    assert (stats["batches"], stats["errors"]) == (2, 1)
+    assert "boom" in stats["last_error"]
+
+
+def test_local_mode_cleans_scores_and_persists(monkeypatch, tmp_path):
+    pytest.importorskip("cleaning_agent.app.cleaner")
+    pytest.importorskip("scoring_agent.app.engine")
+    from app.stages import LocalStages
+
+    from scoring_agent.app import storage, train
+    from scoring_agent.app.model import ModelRegistry, model
+    from scoring_agent.app.schemas import CompanyIn, LeadIn
+
+    # a fresh store and registry, so the scoring singletons are left untouched
+    store = storage.InMemoryStore()
+    monkeypatch.setattr(storage, "store", store)
+    monkeypatch.setattr(train, "store", store)
+    monkeypatch.setattr(model, "registry", ModelRegistry(tmp_path))
+    monkeypatch.setattr(model, "_live", None)
+
+    store.add_many_companies(
+        [
+            CompanyIn(id=i, industry=ind, region=reg, typical_project_budget_euro=b)
+            for i, (ind, reg, b) in enumerate(
+                [("saas", "dach", 10000), ("fintech", "uki", 20000), ("saas", "uki", 5)]
+            )
+        ]
+    )
+    store.add_many_leads(
+        [LeadIn(id=i, industry="saas", region="dach") for i in range(20)]
+    )
+    assert train.train_model()["trained"]
+
+    raw = [
+        {
+            "id": i,
+            "email": f"LEAD{i}@TEST.COM",
+            "rough_budget_raw": "$10k",
+            "first_contacted_raw": "14-07-2025",
+            "phone": "+31 6 12 34 56 78",
+            "region": "Germany",
+            "industry_raw": "saas",
+        }
+        for i in range(7)
+    ]
+    stages = LocalStages(raw, batch_size=3, top_k=2)
+    stats = asyncio.run(Pipeline.from_stages(stages).drain())
+
+    assert [lead["id"] for lead in stages.cleaned] == list(range(7))
+    assert stages.cleaned[0]["region"] == "dach"
+    assert len(stages.matches) == 7 * 2
+    assert stats["stages"]["persist"]["items"] == 7
@@ -1,6 +1,6 @@
 """HTTP client for Django API access.
 
-Fetches LeadCompanyMatch entries for downstream analysis.
+Fetches LeadCompanyMatch statistics for the report summary.
 """
 
 import os
@@ -8,34 +8,31 @@ import os
 import httpx
 
 DJANGO_BASE_URL = os.getenv("DJANGO_BASE_URL", "http://django:8000")
-MATCHES_ENDPOINT = os.getenv("MATCHES_ENDPOINT", "/api/matches/")
+MATCH_STATS_ENDPOINT = os.getenv("MATCH_STATS_ENDPOINT", "/api/matches/stats/")
 TIMEOUT_SECONDS = float(os.getenv("TIMEOUT_SECONDS", "15"))
 
 
-def get_top_matches(limit: int = 50) -> dict:
-    """Fetch top-scoring LeadCompanyMatch entries from Django.
+def _headers() -> dict:
+    headers = {}
+    api_key = os.getenv("DJANGO_API_KEY")
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    return headers
 
-    The Django API is expected to support ordering and limit query params.
 
-    Args:
-        limit: Maximum number of matches to return.
+def get_match_stats() -> dict:
+    """Fetch match statistics aggregated by Django over the full match table.
 
     Returns:
-        Parsed JSON payload from Django. Shape depends on your DRF serializer,
-        typically a list or paginated dict containing match objects with fields
-        like: lead, company, score, matched_at, and any normalized attributes.
+        Small JSON document: count, score mean/median/p90/max, and top
+        industries, regions and budgets.
 
     Raises:
         httpx.HTTPError: If the request fails or times out.
     """
-    url = f"{DJANGO_BASE_URL.rstrip('/')}/{MATCHES_ENDPOINT.lstrip('/')}"
-    params = {"ordering": "-score", "limit": limit}
-    headers = {}
-    api_key = os.getenv("DJANGO_API_KEY")
-    if api_key:
-        headers["Authorization"] = f"Bearer {api_key}"
+    url = f"{DJANGO_BASE_URL.rstrip('/')}/{MATCH_STATS_ENDPOINT.lstrip('/')}"
 
     with httpx.Client(timeout=TIMEOUT_SECONDS) as client:
-        resp = client.get(url, params=params, headers=headers)
+        resp = client.get(url, headers=_headers())
         resp.raise_for_status()
         return resp.json()
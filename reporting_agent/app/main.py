@@ -1,9 +1,6 @@
 """Reporting Agent FastAPI application."""
 
-import os
-
-from app.analysis import compute_basic_stats
-from app.client import get_top_matches
+from app.client import get_match_stats
 from app.summarizer import summarize
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -39,20 +36,16 @@ def health() -> dict:
 
 @app.get("/generate-report", response_model=ReportResponse)
 def generate_report() -> ReportResponse:
-    """Generate a placeholder report.
+    """Generate a report over all LeadCompanyMatch data.
 
-    This stub will be replaced to:
-    1) fetch top matches from Django,
-    2) compute trends,
-    3) summarize via a tiny LLM.
+    1) fetch aggregated match statistics from Django (computed in the database),
+    2) summarize via a tiny LLM.
 
     Returns:
-        ReportResponse with a placeholder summary and empty stats.
+        ReportResponse with the summary and the stats it was built from.
     """
     try:
-        limit = int(os.getenv("REPORT_TOP_N", "50"))
-        matches = get_top_matches(limit=limit)
-        stats = compute_basic_stats(matches)
+        stats = get_match_stats()
         summary = summarize(stats)
         return ReportResponse(summary=summary, stats=stats)
     except Exception as exc:
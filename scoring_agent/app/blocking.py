@@ -0,0 +1,53 @@
+"""Candidate blocking on exact region/industry matches.
+
+Two of the four match features are region/industry equality flags, so a
+company sharing neither with a lead is known to score low before the model
+runs. ``CandidateIndex`` keeps the catalog positions per region and industry
+code so scoring can be restricted to plausible pairs.
+"""
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def _group_positions(codes: np.ndarray) -> Dict[int, np.ndarray]:
+    """Map every non-negative code to the sorted positions holding it."""
+    order = np.argsort(codes, kind="stable")
+    sorted_codes = codes[order]
+    keep = sorted_codes >= 0
+    order, sorted_codes = order[keep], sorted_codes[keep]
+    boundaries = np.flatnonzero(np.diff(sorted_codes)) + 1
+    return {
+        int(group_codes[0]): positions
+        for group_codes, positions in zip(
+            np.split(sorted_codes, boundaries), np.split(order, boundaries)
+        )
+        if len(positions)
+    }
+
+
+class CandidateIndex:
+    """Inverted index from region/industry code to company positions."""
+
+    def __init__(self, regions: np.ndarray, industries: np.ndarray):
+        self._by_region = _group_positions(regions)
+        self._by_industry = _group_positions(industries)
+        self._cache: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def candidates(self, region: int, industry: int) -> np.ndarray:
+        """
+        Return sorted company positions sharing the region or the industry code.
+
+        Codes below 0 (missing/unknown) match nothing.
+        """
+        key = (region, industry)
+        found = self._cache.get(key)
+        if found is None:
+            empty = np.empty(0, dtype=np.intp)
+            found = np.union1d(
+                self._by_region.get(region, empty),
+                self._by_industry.get(industry, empty),
+            ).astype(np.intp)
+            self._cache[key] = found
+        return found
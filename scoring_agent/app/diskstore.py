@@ -0,0 +1,423 @@
+"""On-disk columnar store (``STORE_BACKEND=disk``).
+
+Each table (leads, companies) is a directory of immutable segments, one per
+ingest call. A segment holds the scoring columns as ``.npy`` arrays (id,
+budget, integer-coded region and industry, and the number of the ingest that
+wrote the row, used as the training watermark), opened memory-mapped, plus the
+full records as NDJSON with an offsets array for random access. Records are
+deduplicated by ``id``: a row is live unless a newer segment holds the same
+id. Liveness is recomputed from the segments when a table is opened, so a
+crash at any point never leaves duplicates visible. Small segments are merged
+once there are more than ``STORE_MAX_SEGMENTS`` of them.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+from threading import RLock
+from typing import Iterable, List, Optional, Tuple, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from .schemas import CompanyIn, LeadIn
+from .storage import CompanyMatrix, category_codes
+
+STORE_MAX_SEGMENTS = int(os.getenv("STORE_MAX_SEGMENTS", "16"))
+
+SEGMENT_PREFIX = "seg-"
+# id column value for records without an id; never deduplicated
+MISSING_ID = -1
+
+
+def _write_json_atomic(path: Path, obj):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(obj))
+    os.replace(tmp, path)
+
+
+class Segment:
+    """One immutable, memory-mapped batch of records."""
+
+    COLUMNS = ("ids", "budgets", "regions", "industries", "ingests")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.seq = int(path.name[len(SEGMENT_PREFIX) :])
+        for name in self.COLUMNS:
+            setattr(self, name, np.load(path / f"{name}.npy", mmap_mode="r"))
+        self.offsets = np.load(path / "offsets.npy", mmap_mode="r")
+        # mapped now so readers keep working after compaction deletes the file;
+        # an empty file cannot be mapped (no rows, nothing to read)
+        with open(path / "records.ndjson", "rb") as f:
+            self._records = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if len(self) else b""
+            )
+        self.live = np.ones(len(self.ids), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def record_bytes(self, row: int) -> bytes:
+        return self._records[int(self.offsets[row]) : int(self.offsets[row + 1])]
+
+    @classmethod
+    def write(
+        cls,
+        path: Path,
+        ids: np.ndarray,
+        budgets: np.ndarray,
+        regions: np.ndarray,
+        industries: np.ndarray,
+        ingests: np.ndarray,
+        lines: Iterable[bytes],
+        replaces: List[str] = (),
+    ) -> "Segment":
+        """Write a segment to a temp directory and rename it into place."""
+        tmp = path.with_name("." + path.name + ".tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        np.save(tmp / "ids.npy", ids.astype(np.int64))
+        np.save(tmp / "budgets.npy", budgets.astype(np.float64))
+        np.save(tmp / "regions.npy", regions.astype(np.int32))
+        np.save(tmp / "industries.npy", industries.astype(np.int32))
+        np.save(tmp / "ingests.npy", ingests.astype(np.int64))
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        with open(tmp / "records.ndjson", "wb") as f:
+            for i, line in enumerate(lines):
+                f.write(line)
+                offsets[i + 1] = offsets[i] + len(line)
+        np.save(tmp / "offsets.npy", offsets)
+        if replaces:
+            _write_json_atomic(tmp / "replaces.json", list(replaces))
+        os.rename(tmp, path)
+        return cls(path)
+
+
+class RecordView(Sequence):
+    """
+    Read-only sequence over the live records of a table snapshot.
+
+    Records are parsed from the mapped NDJSON on access, so holding the view
+    costs only the row indices. ``region_vocab`` and ``industry_vocab`` are
+    the table's vocabularies (code -> value) as of the view, a copy taken
+    under the table lock so readers never see them change.
+    """
+
+    def __init__(
+        self,
+        parts: List[Tuple[Segment, np.ndarray]],
+        model: Type[BaseModel],
+        region_vocab: Tuple[str, ...] = (),
+        industry_vocab: Tuple[str, ...] = (),
+    ):
+        self.parts = parts
+        self._model = model
+        self.region_vocab = region_vocab
+        self.industry_vocab = industry_vocab
+        self._starts = np.cumsum([0] + [len(rows) for _, rows in parts])
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("record index out of range")
+        k = int(np.searchsorted(self._starts, i, side="right")) - 1
+        segment, rows = self.parts[k]
+        return self._parse(segment, rows[i - self._starts[k]])
+
+    def __iter__(self):
+        for segment, rows in self.parts:
+            for row in rows:
+                yield self._parse(segment, row)
+
+    def _parse(self, segment: Segment, row) -> BaseModel:
+        return self._model.model_validate_json(segment.record_bytes(int(row)))
+
+
+class SegmentTable:
+    """Append-only, id-deduplicated table of one Pydantic model."""
+
+    def __init__(
+        self,
+        path: Path,
+        model: Type[BaseModel],
+        budget_field: str,
+        max_segments: int = STORE_MAX_SEGMENTS,
+    ):
+        self.path = path
+        self.model = model
+        self.budget_field = budget_field
+        self.max_segments = max(2, max_segments)
+        self._lock = RLock()
+        path.mkdir(parents=True, exist_ok=True)
+
+        vocab_path = path / "vocab.json"
+        vocab = (
+            json.loads(vocab_path.read_text())
+            if vocab_path.exists()
+            else {"region": [], "industry": []}
+        )
+        # value -> code, insertion ordered so list(vocab) maps code -> value
+        self.region_vocab = {v: i for i, v in enumerate(vocab["region"])}
+        self.industry_vocab = {v: i for i, v in enumerate(vocab["industry"])}
+
+        self._recover()
+        self.segments = [
+            Segment(p)
+            for p in sorted(path.glob(SEGMENT_PREFIX + "*"), key=self._seq_of)
+        ]
+        self._next_seq = max((s.seq for s in self.segments), default=0) + 1
+        self._dedup_all()
+        self._publish()
+        self.watermark = max(
+            (int(s.ingests.max()) for s in self.segments if len(s)), default=0
+        )
+
+    @staticmethod
+    def _seq_of(path: Path) -> int:
+        return int(path.name[len(SEGMENT_PREFIX) :])
+
+    def _recover(self):
+        """Drop unfinished writes and segments already merged into a newer one."""
+        for tmp in self.path.glob("." + SEGMENT_PREFIX + "*.tmp"):
+            shutil.rmtree(tmp, ignore_errors=True)
+        for marker in self.path.glob(SEGMENT_PREFIX + "*/replaces.json"):
+            for name in json.loads(marker.read_text()):
+                shutil.rmtree(self.path / name, ignore_errors=True)
+
+    def _dedup_all(self):
+        """Mark every row dead unless it is the newest row with its id."""
+        if not self.segments:
+            return
+        ids = np.concatenate([s.ids for s in self.segments])
+        _, first_in_reversed = np.unique(ids[::-1], return_index=True)
+        keep = np.zeros(len(ids), dtype=bool)
+        keep[len(ids) - 1 - first_in_reversed] = True
+        keep[ids == MISSING_ID] = True
+        start = 0
+        for segment in self.segments:
+            segment.live = keep[start : start + len(segment)]
+            start += len(segment)
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def append(self, records: List[BaseModel]) -> int:
+        """Store ``records``; a record replaces any earlier one with its id."""
+        if not records:
+            return 0
+        # within the batch too, the last record with an id wins
+        seen = set()
+        batch = []
+        for record in reversed(records):
+            if record.id is not None:
+                if record.id in seen:
+                    continue
+                seen.add(record.id)
+            batch.append(record)
+        batch.reverse()
+
+        with self._lock:
+            n_regions, n_industries = len(self.region_vocab), len(self.industry_vocab)
+            ids = np.array(
+                [MISSING_ID if r.id is None else r.id for r in batch], dtype=np.int64
+            )
+            budgets = np.array(
+                [getattr(r, self.budget_field) or 0 for r in batch], dtype=np.float64
+            )
+            regions = category_codes([r.region for r in batch], self.region_vocab)
+            industries = category_codes(
+                [r.industry for r in batch], self.industry_vocab
+            )
+            # the codes must be resolvable before the segment exists
+            if (len(self.region_vocab), len(self.industry_vocab)) != (
+                n_regions,
+                n_industries,
+            ):
+                self._save_vocab()
+
+            ingest = self._next_seq
+            segment = Segment.write(
+                self.path / f"{SEGMENT_PREFIX}{ingest:08d}",
+                ids,
+                budgets,
+                regions,
+                industries,
+                np.full(len(batch), ingest, dtype=np.int64),
+                (r.model_dump_json().encode() + b"\n" for r in batch),
+            )
+            self._next_seq += 1
+
+            new_ids = ids[ids != MISSING_ID]
+            for old in self.segments:
+                replaced = np.isin(old.ids, new_ids)
+                if replaced.any():
+                    old.live &= ~replaced
+            self.segments.append(segment)
+            if len(self.segments) > self.max_segments:
+                self._compact()
+            self._publish()
+            # after the view, so a reader never sees a watermark ahead of it
+            self.watermark = ingest
+        return len(records)
+
+    def _save_vocab(self):
+        _write_json_atomic(
+            self.path / "vocab.json",
+            {"region": list(self.region_vocab), "industry": list(self.industry_vocab)},
+        )
+
+    def _compact(self):
+        """
+        Merge every segment but the largest into one, keeping only live rows.
+
+        The largest is included too once most of its rows are dead.
+        """
+        largest = max(self.segments, key=len)
+        merge = [
+            s for s in self.segments if s is not largest or s.live.sum() < len(s) / 2
+        ]
+        parts = [(s, np.flatnonzero(s.live)) for s in merge]
+        if not sum(len(rows) for _, rows in parts):
+            # every row was replaced by a segment we keep: nothing to rewrite
+            for s in merge:
+                shutil.rmtree(s.path, ignore_errors=True)
+            self.segments = [s for s in self.segments if s not in merge]
+            return
+        path = self.path / f"{SEGMENT_PREFIX}{self._next_seq:08d}"
+        self._next_seq += 1
+        merged = Segment.write(
+            path,
+            np.concatenate([s.ids[rows] for s, rows in parts]),
+            np.concatenate([s.budgets[rows] for s, rows in parts]),
+            np.concatenate([s.regions[rows] for s, rows in parts]),
+            np.concatenate([s.industries[rows] for s, rows in parts]),
+            np.concatenate([s.ingests[rows] for s, rows in parts]),
+            (s.record_bytes(int(row)) for s, rows in parts for row in rows),
+            replaces=[s.path.name for s in merge],
+        )
+        for s in merge:
+            shutil.rmtree(s.path, ignore_errors=True)
+        (path / "replaces.json").unlink()
+        self.segments = [s for s in self.segments if s not in merge] + [merged]
+
+    def _publish(self):
+        """Swap in a view of the current live rows; readers never lock."""
+        self._view = RecordView(
+            [(s, np.flatnonzero(s.live)) for s in self.segments],
+            self.model,
+            tuple(self.region_vocab),
+            tuple(self.industry_vocab),
+        )
+
+    def records(self) -> RecordView:
+        return self._view
+
+    def columns(
+        self, since: int = 0, upto: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, RecordView]:
+        """
+        Live ``(budgets, regions, industries)`` and the view they come from.
+
+        Codes are in the view's ``region_vocab``/``industry_vocab``. Only rows
+        written by an ingest in ``(since, upto]`` are included.
+        """
+        view = self._view
+        parts = view.parts
+        if since > 0 or upto is not None:
+            upto = np.iinfo(np.int64).max if upto is None else upto
+            window = []
+            for segment, rows in parts:
+                ingests = np.asarray(segment.ingests)[rows]
+                window.append((segment, rows[(ingests > since) & (ingests <= upto)]))
+            parts = window
+        if not parts:
+            return (
+                np.empty(0, np.float64),
+                np.empty(0, np.int32),
+                np.empty(0, np.int32),
+                view,
+            )
+        budgets, regions, industries = (
+            np.concatenate([np.asarray(getattr(s, name))[rows] for s, rows in parts])
+            for name in ("budgets", "regions", "industries")
+        )
+        return budgets, regions, industries, view
+
+
+def _recode(codes: np.ndarray, vocab: Tuple[str, ...], target: dict) -> np.ndarray:
+    """Translate codes of ``vocab`` into codes of ``target`` (-1 if absent)."""
+    # the trailing -1 makes code -1 (missing) map to -1
+    table = np.array([target.get(v, -1) for v in vocab] + [-1], dtype=np.int32)
+    return table[codes]
+
+
+class DiskStore:
+    """Store with the ``InMemoryStore`` API, persisted under ``path``."""
+
+    def __init__(self, path: Path, max_segments: int = STORE_MAX_SEGMENTS):
+        self._lock = RLock()
+        path.mkdir(parents=True, exist_ok=True)
+        id_path = path / "store_id"
+        if not id_path.exists():
+            id_path.write_text(uuid.uuid4().hex)
+        # identifies this data directory across restarts
+        self.store_id = id_path.read_text().strip()
+        self._leads = SegmentTable(
+            path / "leads", LeadIn, "budget_normalized_euro", max_segments
+        )
+        self._companies = SegmentTable(
+            path / "companies", CompanyIn, "typical_project_budget_euro", max_segments
+        )
+        self._company_matrix = CompanyMatrix.empty().extend(self.companies())
+
+    def add_many_leads(self, leads: List[LeadIn]) -> int:
+        return self._leads.append(leads)
+
+    def add_many_companies(self, companies: List[CompanyIn]) -> int:
+        with self._lock:
+            added = self._companies.append(companies)
+            # rebuilt so replaced companies drop out; the catalog is small
+            self._company_matrix = CompanyMatrix.empty().extend(self.companies())
+            return added
+
+    def leads(self) -> RecordView:
+        return self._leads.records()
+
+    def companies(self) -> RecordView:
+        return self._companies.records()
+
+    def company_matrix(self) -> CompanyMatrix:
+        return self._company_matrix
+
+    def lead_watermark(self) -> int:
+        """Number of the latest lead ingest (0 before the first)."""
+        return self._leads.watermark
+
+    def lead_feature_columns(
+        self, companies: CompanyMatrix, since: int = 0, upto: Optional[int] = None
+    ):
+        """
+        Lead budgets and region/industry codes in ``companies``' vocabularies.
+
+        Only leads written by an ingest in ``(since, upto]`` are included.
+        """
+        budgets, regions, industries, view = self._leads.columns(since, upto)
+        return (
+            budgets,
+            _recode(regions, view.region_vocab, companies.region_vocab),
+            _recode(industries, view.industry_vocab, companies.industry_vocab),
+        )
+
+    def count(self):
+        return len(self._leads), len(self._companies)
@@ -0,0 +1,229 @@
+"""Vectorized lead × company scoring.
+
+Builds the feature matrix for a whole batch of leads against the company
+catalog in one pass (same features as ``train._encode_pair``) and scores it
+with the model's predictor on large chunks instead of one sklearn call per pair.
+"""
+
+import os
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .model import model
+from .schemas import LeadIn
+from .storage import CompanyMatrix, lookup_codes
+
+# Upper bound on (lead, company) rows sent to the model in a single call.
+SCORE_CHUNK_ROWS = int(os.getenv("SCORE_CHUNK_ROWS", "262144"))
+
+N_FEATURES = 4
+
+
+class LeadColumns(NamedTuple):
+    """Lead batch encoded against a company catalog's vocabularies."""
+
+    budgets: np.ndarray
+    regions: np.ndarray
+    industries: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.budgets)
+
+    def slice(self, start: int, stop: int) -> "LeadColumns":
+        return LeadColumns(
+            self.budgets[start:stop],
+            self.regions[start:stop],
+            self.industries[start:stop],
+        )
+
+
+def encode_leads(leads: List[LeadIn], companies: CompanyMatrix) -> LeadColumns:
+    """Encode leads as columns comparable with ``companies``."""
+    return LeadColumns(
+        np.array(
+            [lead.budget_normalized_euro or 0 for lead in leads], dtype=np.float64
+        ),
+        lookup_codes([lead.region for lead in leads], companies.region_vocab),
+        lookup_codes([lead.industry for lead in leads], companies.industry_vocab),
+    )
+
+
+def encode_matrix(
+    leads: LeadColumns, companies: CompanyMatrix, dtype=np.float64
+) -> np.ndarray:
+    """
+    Build the feature matrix for every (lead, company) pair.
+
+    Row ``i * n_companies + j`` holds the features of lead ``i`` and company
+    ``j``, identical to ``_encode_pair(lead_i, company_j)``.
+
+    Returns:
+        np.ndarray: ``dtype`` array of shape (n_leads * n_companies, 4).
+    """
+    n_leads, n_companies = len(leads), len(companies)
+    X = np.empty((n_leads, n_companies, N_FEATURES), dtype=dtype)
+    X[:, :, 0] = leads.budgets[:, None]
+    X[:, :, 1] = companies.budgets[None, :]
+    X[:, :, 2] = (leads.regions[:, None] == companies.regions[None, :]) & (
+        leads.regions[:, None] >= 0
+    )
+    X[:, :, 3] = (leads.industries[:, None] == companies.industries[None, :]) & (
+        leads.industries[:, None] >= 0
+    )
+    return X.reshape(n_leads * n_companies, N_FEATURES)
+
+
+def encode_pairs(
+    leads: LeadColumns,
+    lead_idx: np.ndarray,
+    companies: CompanyMatrix,
+    company_idx: np.ndarray,
+    dtype=np.float64,
+) -> np.ndarray:
+    """
+    Build features for explicit pairs ``(lead_idx[k], company_idx[k])``.
+
+    Returns:
+        np.ndarray: ``dtype`` array of shape (len(lead_idx), 4).
+    """
+    lead_regions = leads.regions[lead_idx]
+    lead_industries = leads.industries[lead_idx]
+    X = np.empty((len(lead_idx), N_FEATURES), dtype=dtype)
+    X[:, 0] = leads.budgets[lead_idx]
+    X[:, 1] = companies.budgets[company_idx]
+    X[:, 2] = (lead_regions == companies.regions[company_idx]) & (lead_regions >= 0)
+    X[:, 3] = (lead_industries == companies.industries[company_idx]) & (
+        lead_industries >= 0
+    )
+    return X
+
+
+class Candidates(NamedTuple):
+    """One lead's scores for the companies kept by prefiltering."""
+
+    index: np.ndarray  # catalog positions, ascending
+    scores: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+
+def _score_candidates(
+    leads: LeadColumns, companies: CompanyMatrix, predictor
+) -> List[Candidates]:
+    """
+    Score only the pairs kept by the catalog's blocking index.
+
+    Pairs sharing neither region nor industry are never materialized, so
+    time and memory follow the number of candidates, not leads × companies.
+    """
+    index = companies.candidate_index
+    per_lead = [
+        index.candidates(region, industry)
+        for region, industry in zip(leads.regions.tolist(), leads.industries.tolist())
+    ]
+    counts = [len(c) for c in per_lead]
+    lead_idx = np.repeat(np.arange(len(leads)), counts)
+    company_idx = np.concatenate(per_lead) if per_lead else np.empty(0, np.intp)
+
+    scores = np.empty(0)
+    if len(lead_idx):
+        X = encode_pairs(leads, lead_idx, companies, company_idx, predictor.dtype)
+        scores = predictor.predict(X)
+    # views into one scored array, one per lead
+    per_lead_scores = np.split(scores, np.cumsum(counts)[:-1])
+    return [Candidates(c, p) for c, p in zip(per_lead, per_lead_scores)]
+
+
+def iter_score_chunks(
+    leads: List[LeadIn],
+    companies: CompanyMatrix,
+    chunk_rows: int = SCORE_CHUNK_ROWS,
+    prefilter: bool = False,
+) -> Iterator[Tuple[int, Sequence]]:
+    """
+    Score leads against the company catalog chunk by chunk.
+
+    With ``prefilter`` only companies sharing the lead's region or industry
+    are scored and each lead gets a ``Candidates`` row instead of a dense
+    one. Every chunk is scored by the model that was live when the first one
+    was, even if a new version is activated meanwhile.
+
+    Yields:
+        (start, probs): one row per lead of ``leads[start:start + len(probs)]``;
+        an (n_chunk_leads, n_companies) array of match probabilities, or a
+        list of ``Candidates`` with ``prefilter``.
+    """
+    predictor = model.predictor()
+    columns = encode_leads(leads, companies)
+    n_companies = len(companies)
+    step = max(1, chunk_rows // max(1, n_companies))
+    for start in range(0, len(leads), step):
+        chunk = columns.slice(start, start + step)
+        if prefilter:
+            yield start, _score_candidates(chunk, companies, predictor)
+            continue
+        X = encode_matrix(chunk, companies, predictor.dtype)
+        yield start, predictor.predict(X).reshape(len(chunk), n_companies)
+
+
+def select_top(
+    probs: np.ndarray,
+    top_k: Optional[int] = None,
+    min_score: Optional[float] = None,
+) -> np.ndarray:
+    """
+    Pick the positions in ``probs`` worth returning for one lead, ascending.
+
+    ``min_score`` drops companies whose rounded score is below it; ``top_k``
+    keeps the k highest rounded scores, ties going to the earlier position, so
+    the result is a prefix of the full ranking. The cut-off score is found
+    with ``np.partition`` (O(n) instead of a full sort).
+    """
+    candidates = np.arange(len(probs))
+    rounded = np.round(probs, 3)
+    if min_score is not None:
+        keep = rounded >= min_score
+        candidates, rounded = candidates[keep], rounded[keep]
+    if top_k is not None and top_k < len(candidates):
+        cutoff = -np.partition(-rounded, top_k - 1)[top_k - 1]
+        above = rounded > cutoff
+        # fill the remaining slots with the first companies scoring the cut-off
+        at_cutoff = np.flatnonzero(rounded == cutoff)[: top_k - above.sum()]
+        above[at_cutoff] = True
+        candidates = candidates[above]
+    return candidates
+
+
+def rank_companies(
+    row: Union[np.ndarray, Candidates],
+    companies: CompanyMatrix,
+    top_k: Optional[int] = None,
+    min_score: Optional[float] = None,
+) -> List[dict]:
+    """
+    Turn one lead's row into the ``/score`` list, best matches first.
+
+    ``row`` is a dense probability row over the catalog or the lead's
+    ``Candidates``. Scores are rounded to 3 decimals before sorting; ties keep
+    catalog order. Only the companies kept by ``select_top`` are built.
+    """
+    if isinstance(row, Candidates):
+        positions, probs = row.index, row.scores
+    else:
+        positions, probs = None, row
+    selected = select_top(probs, top_k, min_score)
+    rounded = [round(p, 3) for p in probs[selected].tolist()]
+    if positions is not None:
+        selected = positions[selected]
+    selected = selected.tolist()
+    order = sorted(range(len(selected)), key=rounded.__getitem__, reverse=True)
+    return [
+        {
+            "company_id": companies.ids[selected[i]],
+            "company_name": companies.names[selected[i]],
+            "score": rounded[i],
+        }
+        for i in order
+    ]
@@ -0,0 +1,132 @@
+"""Chunked, concurrent forwarding of scored match rows to Django."""
+
+import asyncio
+import os
+from itertools import islice
+from typing import Iterable, List, Optional
+
+import httpx
+
+FORWARD_CHUNK_SIZE = int(os.getenv("FORWARD_CHUNK_SIZE", "5000"))
+FORWARD_CONCURRENCY = int(os.getenv("FORWARD_CONCURRENCY", "4"))
+FORWARD_MAX_RETRIES = int(os.getenv("FORWARD_MAX_RETRIES", "3"))
+FORWARD_BACKOFF_SECONDS = float(os.getenv("FORWARD_BACKOFF_SECONDS", "0.5"))
+FORWARD_TIMEOUT_SECONDS = float(os.getenv("FORWARD_TIMEOUT_SECONDS", "30"))
+
+# Worth another attempt: the request may succeed once Django catches up.
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+def _chunked(rows: Iterable[dict], size: int) -> Iterable[List[dict]]:
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+class MatchForwarder:
+    """
+    POST match rows to Django's ingest endpoint over a shared connection pool.
+
+    Rows are split into chunks of ``chunk_size``; at most ``concurrency`` chunks
+    are in flight at once, and failed chunks are retried with exponential
+    backoff. Rows are consumed lazily, so only in-flight chunks are held in memory.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        api_key: Optional[str] = None,
+        chunk_size: int = FORWARD_CHUNK_SIZE,
+        concurrency: int = FORWARD_CONCURRENCY,
+        max_retries: int = FORWARD_MAX_RETRIES,
+        backoff: float = FORWARD_BACKOFF_SECONDS,
+        timeout: float = FORWARD_TIMEOUT_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url
+        self.api_key = api_key
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            headers = {"Content-Type": "application/json"}
+            if self.api_key:
+                headers["X-API-Key"] = self.api_key
+            self._client = httpx.AsyncClient(
+                headers=headers,
+                timeout=self.timeout,
+                transport=self.transport,
+                limits=httpx.Limits(
+                    max_connections=self.concurrency,
+                    max_keepalive_connections=self.concurrency,
+                ),
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _send_chunk(self, index: int, rows: List[dict]) -> dict:
+        client = self._get_client()
+        result = {"chunk": index, "rows": len(rows), "status": None, "attempts": 0}
+        for attempt in range(self.max_retries + 1):
+            result["attempts"] = attempt + 1
+            try:
+                r = await client.post(self.url, json={"matches": rows})
+            except httpx.TransportError as exc:
+                result["error"] = str(exc) or type(exc).__name__
+            else:
+                result.pop("error", None)
+                result["status"] = r.status_code
+                result["body"] = r.text
+                if r.headers.get("content-type", "").startswith("application/json"):
+                    try:
+                        result["body"] = r.json()
+                    except ValueError:
+                        # Django said JSON but sent something else: the outcome
+                        # of the chunk is unknown, so it counts as failed
+                        result["error"] = "invalid JSON response"
+                if r.status_code not in RETRY_STATUSES:
+                    break
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.backoff * 2**attempt)
+        return result
+
+    async def forward(self, rows: Iterable[dict]) -> dict:
+        """
+        Send all rows and aggregate the per-chunk outcome.
+
+        Returns:
+            dict: ``{"forwarded": int, "failed": int, "chunks": [...]}`` where
+            ``forwarded`` counts rows in chunks Django accepted with a 2xx
+            and a readable response; every other row is ``failed``.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def run(index, chunk):
+            try:
+                return await self._send_chunk(index, chunk)
+            finally:
+                semaphore.release()
+
+        tasks = []
+        for index, chunk in enumerate(_chunked(rows, self.chunk_size)):
+            await semaphore.acquire()
+            tasks.append(asyncio.create_task(run(index, chunk)))
+        chunks = list(await asyncio.gather(*tasks))
+
+        ok = sum(
+            c["rows"]
+            for c in chunks
+            if c["status"] and 200 <= c["status"] < 300 and "error" not in c
+        )
+        total = sum(c["rows"] for c in chunks)
+        return {"forwarded": ok, "failed": total - ok, "chunks": chunks}
@@ -1,10 +1,14 @@
+import json
 import os
-from typing import List
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
 
-import httpx
 from fastapi import Body, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
+from .engine import iter_score_chunks, rank_companies
+from .forwarder import MatchForwarder
 from .model import model
 from .schemas import (
     CompanyIn,
@@ -17,13 +21,27 @@ from .schemas import (
     TrainResponse,
 )
 from .storage import store
-from .train import _encode_pair  # reuse vectorization
 from .train import train_model
 
 MATCHES_POST_URL = os.getenv("MATCHES_POST_URL")
 MATCHES_API_KEY = os.getenv("MATCHES_API_KEY")
 
-app = FastAPI(title="Scoring Agent", version="0.1.0")
+forwarder = (
+    MatchForwarder(MATCHES_POST_URL, api_key=MATCHES_API_KEY)
+    if MATCHES_POST_URL
+    else None
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    model.load()
+    yield
+    if forwarder is not None:
+        await forwarder.aclose()
+
+
+app = FastAPI(title="Scoring Agent", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,8 +54,13 @@ app.add_middleware(
 
 @app.get("/health", response_model=HealthResponse)
 def health():
-    # model readiness will be wired after training is implemented
-    return HealthResponse(status="ok", ingested_count=store.count(), model_ready=False)
+    n_leads, _ = store.count()
+    return HealthResponse(
+        status="ok",
+        ingested_count=n_leads,
+        model_ready=model.trained,
+        model_version=model.version,
+    )
 
 
 @app.post("/ingest-cleaned-leads")
@@ -49,11 +72,58 @@ def ingest_cleaned_leads(payload: LeadBatchIn):
 
 
 @app.post("/train", response_model=TrainResponse)
-def train():
-    result = train_model()
+def train(mode: Optional[Literal["full", "incremental"]] = None):
+    """
+    ``mode=incremental`` updates the live model with the leads ingested since
+    it was trained; ``full`` (or ``TRAIN_MODE`` when omitted) refits on all.
+    """
+    result = train_model(mode)
     if not result["trained"]:
         raise HTTPException(status_code=400, detail="No data to train on")
-    return TrainResponse(trained=True, n_samples=result["n_samples"])
+    return TrainResponse(
+        trained=True,
+        n_samples=result["n_samples"],
+        version=result["version"],
+        mode=result["mode"],
+    )
+
+
+@app.get("/models")
+def list_models():
+    """Saved model versions (oldest first) and the live one."""
+    return {
+        "live": model.version,
+        "inference": model.inference,
+        "versions": model.registry.manifests(),
+    }
+
+
+@app.post("/models/inference/{backend}")
+def set_inference(backend: str):
+    """Switch scoring between the NumPy and the sklearn inference path."""
+    try:
+        model.set_inference(backend)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"inference": model.inference}
+
+
+@app.post("/models/rollback")
+def rollback_model():
+    try:
+        version = model.rollback()
+    except KeyError:
+        raise HTTPException(status_code=409, detail="No previous model version")
+    return {"live": version}
+
+
+@app.post("/models/{version}/activate")
+def activate_model(version: str):
+    try:
+        model.load(version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version {version}")
+    return {"live": version}
 
 
 @app.get("/evaluate", response_model=EvaluateResponse)
@@ -63,35 +133,35 @@ def evaluate():
     return EvaluateResponse(metrics={"status": "ok"})
 
 
+def _iter_scored_leads(req: ScoreRequest, companies):
+    """Yield one ``{"lead_id", "scores"}`` item per lead as each chunk is scored."""
+    leads = req.leads
+    for start, probs in iter_score_chunks(leads, companies, prefilter=req.prefilter):
+        for offset, row in enumerate(probs):
+            lead = leads[start + offset]
+            # sorted descending so best matches first
+            scores = rank_companies(row, companies, req.top_k, req.min_score)
+            yield {"lead_id": lead.id, "scores": scores}
+
+
 @app.post("/score")
 def score(req: ScoreRequest):
 
     if not model.trained:
         raise HTTPException(status_code=400, detail="Model not trained")
 
-    leads = req.leads
-    companies = store.companies()
-    if not leads or not companies:
+    companies = store.company_matrix()
+    if not req.leads or not len(companies):
         raise HTTPException(status_code=400, detail="Need both leads and companies")
 
-    results = []
-    for lead in leads:
-        lead_scores = []
-        for company in companies:
-            X = [_encode_pair(lead, company)]
-            prob = float(model.predict(X)[0])
-            lead_scores.append(
-                {
-                    "company_id": company.id,
-                    "company_name": company.name,
-                    "score": round(prob, 3),
-                }
-            )
-        # sort descending so best matches first
-        lead_scores.sort(key=lambda x: x["score"], reverse=True)
-        results.append({"lead_id": lead.id, "scores": lead_scores})
-
-    return {"results": results}
+    if req.stream:
+        lines = (
+            json.dumps(item, separators=(",", ":")) + "\n"
+            for item in _iter_scored_leads(req, companies)
+        )
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    return {"results": list(_iter_scored_leads(req, companies))}
 
 
 @app.post("/ingest-companies")
@@ -103,47 +173,30 @@ def ingest_companies(payload: List[CompanyIn]):
 
 
 def _flatten_results(results):
-    rows = []
     for item in results:
         lead_id = item.get("lead_id")
         for sc in item.get("scores", []):
-            rows.append(
-                {
-                    "lead_id": lead_id,
-                    "company_id": sc.get("company_id"),
-                    "compatibility_score": sc.get("score"),
-                }
-            )
-    return rows
+            yield {
+                "lead_id": lead_id,
+                "company_id": sc.get("company_id"),
+                "compatibility_score": sc.get("score"),
+            }
 
 
 @app.post("/forward-scored-leads")
-def forward_scored_leads(payload: dict = Body(...)):
+async def forward_scored_leads(payload: dict = Body(...)):
     """
     Forward scoring results to Django to persist LeadCompanyMatch.
     Expected payload shape is the output of /score:
       {"results":[{"lead_id":..., "scores":[{"company_id":...,"score":...}, ...]}, ...]}
+    Rows are sent in chunks with bounded concurrency; the response aggregates
+    the Django status of every chunk.
     """
-    if not MATCHES_POST_URL:
+    if forwarder is None:
         raise HTTPException(status_code=500, detail="MATCHES_POST_URL not configured")
 
-    rows = _flatten_results(payload.get("results", []))
-    if not rows:
+    results = payload.get("results", [])
+    if not any(item.get("scores") for item in results):
         raise HTTPException(status_code=400, detail="No rows to forward")
 
-    headers = {"Content-Type": "application/json"}
-    if MATCHES_API_KEY:
-        headers["X-API-Key"] = MATCHES_API_KEY
-
-    r = httpx.post(
-        MATCHES_POST_URL, json={"matches": rows}, headers=headers, timeout=15.0
-    )
-    return {
-        "forwarded": len(rows),
-        "django_status": r.status_code,
-        "django_body": (
-            r.json()
-            if r.headers.get("content-type", "").startswith("application/json")
-            else r.text
-        ),
-    }
+    return await forwarder.forward(_flatten_results(results))
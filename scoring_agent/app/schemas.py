@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class LeadIn(BaseModel):
@@ -28,6 +28,20 @@ class LeadBatchIn(BaseModel):
 
 class ScoreRequest(BaseModel):
     leads: List[LeadIn]
+    top_k: Optional[int] = Field(
+        default=None, ge=1, description="Return only the k best companies per lead"
+    )
+    min_score: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0, description="Drop matches scoring below this"
+    )
+    prefilter: bool = Field(
+        default=False,
+        description="Only score companies sharing the lead's region or industry",
+    )
+    stream: bool = Field(
+        default=False,
+        description="Stream results as NDJSON, one line per lead, as chunks are scored",
+    )
 
 
 class ScoredLead(BaseModel):
@@ -42,6 +56,8 @@ class ScoreResponse(BaseModel):
 class TrainResponse(BaseModel):
     trained: bool
     n_samples: int
+    version: Optional[str] = None
+    mode: Optional[str] = None
 
 
 class EvaluateResponse(BaseModel):
@@ -52,6 +68,7 @@ class HealthResponse(BaseModel):
     status: str
     ingested_count: int
     model_ready: bool
+    model_version: Optional[str] = None
 
 
 class CompanyIn(BaseModel):
@@ -1,36 +1,290 @@
+import os
+import uuid
+from bisect import bisect_right
+from collections.abc import Sequence
+from functools import cached_property
+from itertools import accumulate
+from pathlib import Path
 from threading import RLock
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
+from .blocking import CandidateIndex
 from .schemas import CompanyIn, LeadIn
 
 
+def category_codes(values: List[Optional[str]], vocab: Dict[str, int]) -> np.ndarray:
+    """
+    Map raw category strings to integer codes, growing ``vocab`` as needed.
+
+    Matching is case-insensitive; empty/missing values get -1 so they never
+    compare equal to anything.
+    """
+    codes = np.full(len(values), -1, dtype=np.int32)
+    for i, value in enumerate(values):
+        if value:
+            codes[i] = vocab.setdefault(value.lower(), len(vocab))
+    return codes
+
+
+def lookup_codes(values: List[Optional[str]], vocab: Dict[str, int]) -> np.ndarray:
+    """Map raw category strings to codes of an existing vocab (-1 if unknown)."""
+    codes = np.full(len(values), -1, dtype=np.int32)
+    for i, value in enumerate(values):
+        if value:
+            codes[i] = vocab.get(value.lower(), -1)
+    return codes
+
+
+class CompanyMatrix:
+    """
+    Columnar, array-backed copy of the company catalog.
+
+    Budgets are kept as a float array and region/industry as integer-coded
+    categories so scoring never walks Pydantic objects. Instances are treated
+    as immutable: ``extend`` returns a new matrix, so readers holding an older
+    one are unaffected. The vocabularies are shared and only ever grow.
+    """
+
+    def __init__(
+        self,
+        ids: List[Optional[int]],
+        names: List[Optional[str]],
+        budgets: np.ndarray,
+        regions: np.ndarray,
+        industries: np.ndarray,
+        region_vocab: Dict[str, int],
+        industry_vocab: Dict[str, int],
+    ):
+        self.ids = ids
+        self.names = names
+        self.budgets = budgets
+        self.regions = regions
+        self.industries = industries
+        self.region_vocab = region_vocab
+        self.industry_vocab = industry_vocab
+
+    @classmethod
+    def empty(cls) -> "CompanyMatrix":
+        return cls(
+            [],
+            [],
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.int32),
+            np.empty(0, dtype=np.int32),
+            {},
+            {},
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @cached_property
+    def candidate_index(self) -> CandidateIndex:
+        """Region/industry blocking index, built on first use."""
+        return CandidateIndex(self.regions, self.industries)
+
+    def extend(self, companies: List[CompanyIn]) -> "CompanyMatrix":
+        """Return a new matrix with ``companies`` appended."""
+        budgets = np.array(
+            [c.typical_project_budget_euro or 0 for c in companies], dtype=np.float64
+        )
+        regions = category_codes([c.region for c in companies], self.region_vocab)
+        industries = category_codes(
+            [c.industry for c in companies], self.industry_vocab
+        )
+        return CompanyMatrix(
+            self.ids + [c.id for c in companies],
+            self.names + [c.name for c in companies],
+            np.concatenate([self.budgets, budgets]),
+            np.concatenate([self.regions, regions]),
+            np.concatenate([self.industries, industries]),
+            self.region_vocab,
+            self.industry_vocab,
+        )
+
+
+# Small ingests are merged into the last chunk until it reaches this size.
+SNAPSHOT_CHUNK_SIZE = int(os.getenv("SNAPSHOT_CHUNK_SIZE", "4096"))
+
+
+class Snapshot(Sequence):
+    """
+    Immutable sequence of records stored as a tuple of tuple chunks.
+
+    Writers never modify a snapshot: ``upsert`` returns a new one that shares
+    every untouched chunk with the old one, so taking a snapshot is O(1) and
+    readers holding an older one keep a consistent view without locking.
+    """
+
+    __slots__ = ("_chunks", "_starts")
+
+    def __init__(self, chunks: Tuple[tuple, ...] = ()):
+        self._chunks = chunks
+        self._starts = list(accumulate((len(c) for c in chunks), initial=0))
+
+    def __len__(self) -> int:
+        return self._starts[-1]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("snapshot index out of range")
+        k = bisect_right(self._starts, i) - 1
+        return self._chunks[k][i - self._starts[k]]
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            yield from chunk
+
+    def upsert(
+        self, records: list, index: Dict[int, int]
+    ) -> Tuple["Snapshot", List[int]]:
+        """
+        Return a snapshot with ``records`` appended, replacing any record with
+        the same id, and the positions of the replaced records.
+
+        ``index`` maps id -> position; the caller owns it and it is updated in
+        place, so it must only be used under the writer lock.
+        """
+        size = len(self)
+        replace: Dict[int, Dict[int, object]] = {}
+        appended = []
+        for record in records:
+            pos = None if record.id is None else index.get(record.id)
+            if pos is None:
+                pos = size + len(appended)
+                if record.id is not None:
+                    index[record.id] = pos
+                appended.append(record)
+            elif pos >= size:
+                appended[pos - size] = record
+            else:
+                k = bisect_right(self._starts, pos) - 1
+                replace.setdefault(k, {})[pos - self._starts[k]] = record
+
+        replaced = [
+            self._starts[k] + offset for k, rows in replace.items() for offset in rows
+        ]
+        chunks = list(self._chunks)
+        for k, rows in replace.items():
+            chunk = list(chunks[k])
+            for offset, record in rows.items():
+                chunk[offset] = record
+            chunks[k] = tuple(chunk)
+        if appended:
+            if chunks and len(chunks[-1]) + len(appended) <= SNAPSHOT_CHUNK_SIZE:
+                chunks[-1] = chunks[-1] + tuple(appended)
+            else:
+                chunks.append(tuple(appended))
+        return Snapshot(tuple(chunks)), replaced
+
+
 class InMemoryStore:
+    """
+    Process-local store; records are deduplicated by ``id`` (last wins).
+
+    Writers serialize on a lock and publish new immutable snapshots by
+    rebinding an attribute; readers just load the current one, so they never
+    wait for an ingest or copy the dataset.
+
+    Every ingest gets a sequence number (the watermark) and each lead position
+    remembers the ingest that last wrote it, so training can ask for the leads
+    ingested between two watermarks.
+    """
+
     def __init__(self):
         self._lock = RLock()
-        self._leads: List[LeadIn] = []
-        self._companies: List[CompanyIn] = []
+        # new on every start: training watermarks do not carry over a restart
+        self.store_id = uuid.uuid4().hex
+        # (snapshot, per-position ingest seq, watermark), published together
+        self._lead_state = (Snapshot(), np.empty(0, dtype=np.int64), 0)
+        self._companies = Snapshot()
+        self._lead_index: Dict[int, int] = {}
+        self._company_index: Dict[int, int] = {}
+        self._company_matrix = CompanyMatrix.empty()
 
     def add_many_leads(self, leads: List[LeadIn]) -> int:
         with self._lock:
-            self._leads.extend(leads)
+            snapshot, seqs, watermark = self._lead_state
+            new, replaced = snapshot.upsert(leads, self._lead_index)
+            watermark += 1
+            seqs = np.concatenate(
+                [seqs, np.full(len(new) - len(snapshot), watermark, dtype=np.int64)]
+            )
+            seqs[replaced] = watermark
+            self._lead_state = (new, seqs, watermark)
             return len(leads)
 
     def add_many_companies(self, companies: List[CompanyIn]) -> int:
         with self._lock:
-            self._companies.extend(companies)
+            snapshot, replaced = self._companies.upsert(companies, self._company_index)
+            if replaced:
+                matrix = CompanyMatrix.empty().extend(snapshot)
+            else:
+                matrix = self._company_matrix.extend(companies)
+            self._companies, self._company_matrix = snapshot, matrix
             return len(companies)
 
-    def leads(self) -> List[LeadIn]:
-        with self._lock:
-            return list(self._leads)
+    def leads(self) -> Snapshot:
+        return self._lead_state[0]
 
-    def companies(self) -> List[CompanyIn]:
-        with self._lock:
-            return list(self._companies)
+    def lead_watermark(self) -> int:
+        """Sequence number of the latest lead ingest (0 before the first)."""
+        return self._lead_state[2]
+
+    def companies(self) -> Snapshot:
+        return self._companies
+
+    def company_matrix(self) -> CompanyMatrix:
+        return self._company_matrix
+
+    def lead_feature_columns(
+        self, companies: CompanyMatrix, since: int = 0, upto: Optional[int] = None
+    ):
+        """
+        Lead budgets and region/industry codes in ``companies``' vocabularies.
+
+        Only leads last written by an ingest in ``(since, upto]`` are included.
+        """
+        snapshot, seqs, watermark = self._lead_state
+        upto = watermark if upto is None else upto
+        if since <= 0 and upto >= watermark:
+            leads = snapshot
+        else:
+            selected = np.flatnonzero((seqs > since) & (seqs <= upto))
+            leads = [snapshot[i] for i in selected.tolist()]
+        return (
+            np.array(
+                [lead.budget_normalized_euro or 0 for lead in leads], dtype=np.float64
+            ),
+            lookup_codes([lead.region for lead in leads], companies.region_vocab),
+            lookup_codes([lead.industry for lead in leads], companies.industry_vocab),
+        )
 
     def count(self):
-        with self._lock:
-            return len(self._leads), len(self._companies)
+        return len(self._lead_state[0]), len(self._companies)
+
+
+def create_store():
+    """
+    Build the store selected by ``STORE_BACKEND``.
+
+    ``memory`` (default) keeps everything in this process; ``disk`` persists
+    to ``STORE_PATH`` and survives restarts (see ``diskstore``).
+    """
+    backend = os.getenv("STORE_BACKEND", "memory").lower()
+    if backend == "memory":
+        return InMemoryStore()
+    if backend == "disk":
+        from .diskstore import DiskStore
+
+        return DiskStore(Path(os.getenv("STORE_PATH", "/app/data")))
+    raise ValueError(f"Unknown STORE_BACKEND: {backend!r}")
 
 
-store = InMemoryStore()
+store = create_store()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+from app.model import ModelRegistry, ModelVersion, linear_estimator, model
+
+
+@pytest.fixture
+def model_registry(monkeypatch, tmp_path):
+    """A throwaway registry for the model, with nothing live yet."""
+    registry = ModelRegistry(tmp_path / "models")
+    monkeypatch.setattr(model, "registry", registry)
+    monkeypatch.setattr(model, "_live", None)
+    return registry
+
+
+@pytest.fixture
+def live_model(monkeypatch, model_registry):
+    """A fixed logistic model made live, with a throwaway registry."""
+    version = ModelVersion(
+        linear_estimator(
+            np.array([[1e-5, -2e-5, 1.5, 0.8]]), np.array([-0.5]), np.array([0, 1])
+        ),
+        {"version": "v000001"},
+    )
+    monkeypatch.setattr(model, "_live", version)
+    return version
@@ -0,0 +1,102 @@
+import sys
+import threading
+
+from app.diskstore import DiskStore
+from app.schemas import CompanyIn, LeadIn
+
+
+def _lead(i, region="dach", budget=1000.0):
+    return LeadIn(id=i, region=region, industry="saas", budget_normalized_euro=budget)
+
+
+def test_dedup_keeps_the_newest_record(tmp_path):
+    store = DiskStore(tmp_path)
+    store.add_many_leads([_lead(1), _lead(2)])
+    store.add_many_leads([_lead(2, region="uki"), _lead(3), _lead(3, budget=5.0)])
+    store.add_many_leads([LeadIn(id=None), LeadIn(id=None)])
+
+    leads = {lead.id: lead for lead in store.leads() if lead.id is not None}
+    assert store.count() == (5, 0)
+    assert leads[2].region == "uki"
+    assert leads[3].budget_normalized_euro == 5.0
+
+    store.add_many_companies([CompanyIn(id=1, name="a"), CompanyIn(id=1, name="b")])
+    assert [c.name for c in store.companies()] == ["b"]
+    assert store.company_matrix().names == ["b"]
+
+
+def test_reopen_restores_records_and_recovers(tmp_path):
+    store = DiskStore(tmp_path)
+    store.add_many_leads([_lead(1), _lead(2)])
+    store.add_many_leads([_lead(1, region="uki")])
+    # a write that crashed before its rename is discarded on open
+    (tmp_path / "leads" / ".seg-00000009.tmp").mkdir()
+
+    reopened = DiskStore(tmp_path)
+    assert reopened.count() == (2, 0)
+    assert {lead.id: lead.region for lead in reopened.leads()} == {1: "uki", 2: "dach"}
+    assert reopened.lead_watermark() == store.lead_watermark()
+    assert not list((tmp_path / "leads").glob(".*.tmp"))
+
+
+def test_compaction_merges_segments_and_keeps_live_rows(tmp_path):
+    store = DiskStore(tmp_path, max_segments=4)
+    for i in range(10):
+        store.add_many_leads([_lead(i), _lead(0, budget=float(i))])
+
+    assert len(list((tmp_path / "leads").glob("seg-*"))) <= 4
+    assert store.count() == (10, 0)
+    assert store.leads()[0].id is not None
+    reopened = DiskStore(tmp_path, max_segments=4)
+    assert {lead.id for lead in reopened.leads()} == set(range(10))
+    assert {lead.id: lead for lead in reopened.leads()}[0].budget_normalized_euro == 9
+
+
+def test_compaction_of_only_dead_rows(tmp_path):
+    store = DiskStore(tmp_path, max_segments=4)
+    for _ in range(4):
+        store.add_many_leads([_lead(1)])
+    store.add_many_leads([_lead(1, region="uki"), _lead(2)])
+
+    assert [(lead.id, lead.region) for lead in store.leads()] == [
+        (1, "uki"),
+        (2, "dach"),
+    ]
+    reopened = DiskStore(tmp_path, max_segments=4)
+    assert reopened.count() == (2, 0)
+    reopened.add_many_leads([_lead(3)])
+    assert reopened.count() == (3, 0)
+
+
+def test_feature_columns_while_new_regions_are_ingested(tmp_path):
+    store = DiskStore(tmp_path, max_segments=64)
+    store.add_many_companies([CompanyIn(id=1, region="r0", industry="saas")])
+    store.add_many_leads([_lead(0, region="r0")])
+    companies = store.company_matrix()
+    errors = []
+
+    def ingest():
+        try:
+            for i in range(1, 100):
+                store.add_many_leads(
+                    [_lead(i * 100 + j, region=f"r{i}-{j}") for j in range(100)]
+                )
+        except Exception as e:
+            errors.append(e)
+
+    writer = threading.Thread(target=ingest)
+    interval = sys.getswitchinterval()
+    # switch threads often so reads overlap the vocabulary growing
+    sys.setswitchinterval(1e-6)
+    try:
+        writer.start()
+        while writer.is_alive():
+            _, regions, industries = store.lead_feature_columns(companies)
+            # only r0 is in the company vocabulary
+            assert (regions == 0).sum() == 1
+            assert (regions[regions != 0] == -1).all()
+            assert (industries == 0).all()
+    finally:
+        writer.join()
+        sys.setswitchinterval(interval)
+    assert not errors
@@ -0,0 +1,105 @@
+import numpy as np
+from app.engine import (
+    Candidates,
+    encode_leads,
+    encode_matrix,
+    iter_score_chunks,
+    rank_companies,
+)
+from app.model import model
+from app.schemas import CompanyIn, LeadIn
+from app.storage import CompanyMatrix
+from app.train import _encode_pair
+
+COMPANIES = CompanyMatrix.empty().extend(
+    [
+        CompanyIn(id=1, name="a", region="DACH", industry="SaaS"),
+        CompanyIn(id=2, name="b", region="uki", industry="fintech"),
+        CompanyIn(id=3, name="c", region="dach", industry="retail"),
+        CompanyIn(id=4, name="d", region="nordics", industry="saas"),
+        CompanyIn(id=5, name="e", region=None, industry=None),
+    ]
+)
+
+
+def test_prefilter_with_min_score_and_top_k(live_model):
+    leads = [
+        LeadIn(id=1, region="dach", industry="saas", budget_normalized_euro=1000),
+        LeadIn(id=2, region="uki", industry=None),
+        LeadIn(id=3, region=None, industry=None),
+    ]
+    ((_, probs),) = iter_score_chunks(leads, COMPANIES, prefilter=True)
+    assert [row.index.tolist() for row in probs] == [[0, 2, 3], [1], []]
+
+    ranked = [rank_companies(row, COMPANIES, top_k=2, min_score=0.5) for row in probs]
+    assert [s["company_id"] for s in ranked[0]] == [1, 3]
+    assert [s["company_id"] for s in ranked[1]] == [2]
+    assert ranked[2] == []
+    assert all(s["score"] >= 0.5 for row in ranked for s in row)
+
+
+def test_engine_matches_per_pair_encoding(live_model, monkeypatch):
+    monkeypatch.setattr(model, "inference", "sklearn")
+    companies = [
+        CompanyIn(
+            id=1, region="DACH", industry="SaaS", typical_project_budget_euro=5e3
+        ),
+        CompanyIn(id=2, region="uki", industry="", typical_project_budget_euro=2e4),
+        CompanyIn(id=3, region="", industry="fintech"),
+        CompanyIn(id=4, region=None, industry=None, typical_project_budget_euro=1e4),
+    ]
+    leads = [
+        LeadIn(id=1, region="dach", industry="saas", budget_normalized_euro=5e3),
+        LeadIn(id=2, region="Dach", industry="FINTECH", budget_normalized_euro=1.5e4),
+        LeadIn(id=3, region="UKI", industry=""),
+        LeadIn(id=4, region="", industry=None, budget_normalized_euro=0.0),
+        LeadIn(id=5, region=None, industry="retail", budget_normalized_euro=2e4),
+    ]
+    matrix = CompanyMatrix.empty().extend(companies)
+    pairs = np.array([[_encode_pair(lead, c) for c in companies] for lead in leads])
+    X = encode_matrix(encode_leads(leads, matrix), matrix)
+    np.testing.assert_array_equal(X, pairs.reshape(-1, 4))
+    expected = live_model.estimator.predict_proba(X)[:, 1].reshape(len(leads), -1)
+    # one predict_proba call per pair differs from the batched one by an ulp at most
+    per_pair = [
+        [live_model.estimator.predict_proba([x])[0, 1] for x in row] for row in pairs
+    ]
+    np.testing.assert_allclose(expected, per_pair, rtol=1e-15, atol=0)
+
+    ((_, probs),) = iter_score_chunks(leads, matrix)
+    np.testing.assert_array_equal(probs, expected)
+    chunks = list(iter_score_chunks(leads, matrix, chunk_rows=8))
+    assert [start for start, _ in chunks] == [0, 2, 4]
+    np.testing.assert_array_equal(np.vstack([p for _, p in chunks]), expected)
+
+    ((_, prefiltered),) = iter_score_chunks(leads, matrix, prefilter=True)
+    for row, dense, lead_pairs in zip(prefiltered, expected, pairs):
+        # only pairs sharing neither region nor industry are skipped
+        assert row.index.tolist() == np.flatnonzero(lead_pairs[:, 2:].any(1)).tolist()
+        np.testing.assert_array_equal(row.scores, dense[row.index])
+
+
+def test_top_k_is_a_prefix_of_the_full_ranking():
+    rng = np.random.default_rng(0)
+    companies = CompanyMatrix.empty().extend(
+        [CompanyIn(id=i, name=str(i)) for i in range(200)]
+    )
+    # few distinct rounded scores, and unrounded values that break ties otherwise
+    probs = rng.integers(0, 5, size=200) / 10 + rng.uniform(-4e-4, 4e-4, size=200)
+    index = np.sort(rng.choice(200, size=150, replace=False))
+
+    for row in (probs, Candidates(index, probs[index])):
+        full = rank_companies(row, companies)
+        assert len(full) == len(row)
+        for top_k in (1, 3, 17, 50, 149, 150, 500):
+            assert rank_companies(row, companies, top_k=top_k) == full[:top_k]
+        for min_score in (0.1, 0.3):
+            ranked = [s for s in full if s["score"] >= min_score]
+            for top_k in (1, 5, 40):
+                got = rank_companies(row, companies, top_k=top_k, min_score=min_score)
+                assert got == ranked[:top_k]
+    # the candidates rank like the same companies in a dense row
+    sparse = rank_companies(Candidates(index, probs[index]), companies, top_k=30)
+    dense = np.full(200, -1.0)
+    dense[index] = probs[index]
+    assert sparse == rank_companies(dense, companies, top_k=30)
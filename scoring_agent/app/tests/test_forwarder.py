@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import httpx
+from app import forwarder
+from app.forwarder import MatchForwarder
+
+
+def _rows(n):
+    return (
+        {"lead_id": i, "company_id": 1, "compatibility_score": 0.5} for i in range(n)
+    )
+
+
+def _forward(handler, rows, **kwargs):
+    fwd = MatchForwarder(
+        "http://django/api/matches/ingest/",
+        transport=httpx.MockTransport(handler),
+        **kwargs,
+    )
+
+    async def run():
+        try:
+            return await fwd.forward(rows)
+        finally:
+            await fwd.aclose()
+
+    return asyncio.run(run())
+
+
+def test_forward_chunks_rows_within_the_concurrency_limit():
+    sizes, in_flight, peak = [], [0], [0]
+
+    async def handler(request):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.01)
+        in_flight[0] -= 1
+        rows = json.loads(request.content)["matches"]
+        sizes.append(len(rows))
+        return httpx.Response(200, json={"created": len(rows)})
+
+    result = _forward(handler, _rows(23), chunk_size=5, concurrency=2)
+
+    assert sorted(sizes) == [3, 5, 5, 5, 5]
+    assert peak[0] == 2
+    assert (result["forwarded"], result["failed"]) == (23, 0)
+    assert [c["chunk"] for c in result["chunks"]] == [0, 1, 2, 3, 4]
+    assert result["chunks"][0]["body"] == {"created": 5}
+
+
+def test_forward_retries_with_backoff(monkeypatch):
+    delays = []
+
+    async def no_sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(forwarder.asyncio, "sleep", no_sleep)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("refused")
+        if len(calls) == 2:
+            return httpx.Response(429)
+        if len(calls) == 3:
+            return httpx.Response(503)
+        return httpx.Response(201, json={"created": 2})
+
+    result = _forward(handler, _rows(2), max_retries=3, backoff=0.5)
+
+    (chunk,) = result["chunks"]
+    assert (chunk["status"], chunk["attempts"]) == (201, 4)
+    assert "error" not in chunk
+    assert delays == [0.5, 1.0, 2.0]
+    assert result["forwarded"] == 2
+
+
+def test_forward_gives_up_after_max_retries(monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(forwarder.asyncio, "sleep", no_sleep)
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        raise httpx.ReadTimeout("slow")
+
+    result = _forward(handler, _rows(3), max_retries=2)
+
+    (chunk,) = result["chunks"]
+    assert len(calls) == 3 and chunk["attempts"] == 3
+    assert chunk["status"] is None and chunk["error"] == "slow"
+    assert (result["forwarded"], result["failed"]) == (0, 3)
+
+
+def test_forward_does_not_retry_client_errors():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(400, json={"detail": "bad"})
+
+    result = _forward(handler, _rows(2))
+    assert len(calls) == 1
+    assert result["chunks"][0]["body"] == {"detail": "bad"}
+    assert result["failed"] == 2
+
+
+def test_forward_counts_an_unreadable_json_response_as_failed():
+    def handler(request):
+        rows = json.loads(request.content)["matches"]
+        if rows[0]["lead_id"] == 0:
+            return httpx.Response(
+                200, content=b"<html>oops", headers={"content-type": "application/json"}
+            )
+        return httpx.Response(200, json={"created": len(rows)})
+
+    result = _forward(handler, _rows(4), chunk_size=2)
+
+    bad, good = result["chunks"]
+    assert bad["error"] == "invalid JSON response" and bad["body"] == "<html>oops"
+    assert good["body"] == {"created": 2}
+    assert (result["forwarded"], result["failed"]) == (2, 2)
@@ -0,0 +1,68 @@
+import json
+from functools import partial
+
+import pytest
+from app import engine, main
+from app.schemas import CompanyIn
+from app.storage import InMemoryStore
+from fastapi.testclient import TestClient
+
+REGIONS = ["dach", "uki", "nordics", None]
+INDUSTRIES = ["saas", "fintech", "retail", None]
+
+
+@pytest.fixture
+def client(monkeypatch, live_model):
+    store = InMemoryStore()
+    store.add_many_companies(
+        [
+            CompanyIn(
+                id=j,
+                name=f"c{j}",
+                region=REGIONS[j % 4],
+                industry=INDUSTRIES[j // 4 % 4],
+                typical_project_budget_euro=1000.0 * (j % 7),
+            )
+            for j in range(20)
+        ]
+    )
+    monkeypatch.setattr(main, "store", store)
+    # small chunks, so a stream spans several of them
+    monkeypatch.setattr(
+        main, "iter_score_chunks", partial(engine.iter_score_chunks, chunk_rows=60)
+    )
+    # no context manager: the lifespan would load the model from MODEL_DIR
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"top_k": 3},
+        {"min_score": 0.45},
+        {"top_k": 2, "min_score": 0.3},
+        {"prefilter": True, "top_k": 4, "min_score": 0.2},
+    ],
+)
+def test_streamed_score_matches_the_json_response(client, options):
+    leads = [
+        {
+            "id": i,
+            "region": REGIONS[i % 4],
+            "industry": INDUSTRIES[i % 3],
+            "budget_normalized_euro": 500.0 * i,
+        }
+        for i in range(11)
+    ]
+    body = {"leads": leads, **options}
+
+    plain = client.post("/score", json=body)
+    streamed = client.post("/score", json={**body, "stream": True})
+
+    assert plain.status_code == streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in streamed.text.splitlines()]
+    assert lines == plain.json()["results"]
+    assert [line["lead_id"] for line in lines] == list(range(11))
+    assert any(line["scores"] for line in lines)
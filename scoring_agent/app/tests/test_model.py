@@ -0,0 +1,136 @@
+import os
+import warnings
+
+import numpy as np
+import pytest
+from app.model import MatchModel, ModelRegistry, NumpyLogit, linear_estimator
+
+
+def _features(rng, n, budget_scale):
+    X = np.empty((n, 4))
+    X[:, :2] = rng.uniform(0, budget_scale, size=(n, 2))
+    X[:, 2:] = rng.integers(0, 2, size=(n, 2))
+    return X
+
+
+def test_numpy_logit_matches_predict_proba(live_model):
+    rng = np.random.default_rng(0)
+    logit = NumpyLogit(live_model.estimator.coef_, live_model.estimator.intercept_)
+    # large budgets push the logits far past the float32 range of exp
+    for budget_scale in (5e4, 1e7, 1e9):
+        X = _features(rng, 1000, budget_scale)
+        expected = live_model.estimator.predict_proba(X)[:, 1]
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            got = logit.predict(X)
+        assert got.dtype == np.float32
+        np.testing.assert_allclose(got, expected, rtol=0, atol=1e-6)
+    assert got.min() == 0.0 and got.max() == 1.0
+
+
+def test_numpy_logit_out_and_scratch_reuse(live_model):
+    rng = np.random.default_rng(1)
+    logit = NumpyLogit(live_model.estimator.coef_, live_model.estimator.intercept_)
+    big, small = _features(rng, 64, 1e5), _features(rng, 8, 1e5)
+
+    out = np.empty((64,), dtype=np.float32)
+    assert logit.predict(big, out=out) is out
+    expected = live_model.estimator.predict_proba(big)[:, 1]
+    np.testing.assert_allclose(out, expected, rtol=0, atol=1e-6)
+
+    # a smaller batch reuses the scratch buffer without touching earlier results
+    first = logit.predict(big)
+    np.testing.assert_allclose(
+        logit.predict(small),
+        live_model.estimator.predict_proba(small)[:, 1],
+        rtol=0,
+        atol=1e-6,
+    )
+    np.testing.assert_array_equal(first, out)
+    np.testing.assert_array_equal(logit.predict(big[:0]), np.empty(0))
+
+
+def _estimator(w):
+    return linear_estimator(
+        np.array([[1e-5, -2e-5, w, 0.8]]), np.array([-0.5]), np.array([0, 1])
+    )
+
+
+def test_registry_numbers_versions_and_loads_memory_mapped(tmp_path):
+    registry = ModelRegistry(tmp_path, keep=10)
+    assert registry.versions() == [] and registry.current() is None
+
+    saved = [registry.save(_estimator(w), n_samples=w) for w in (1.0, 2.0, 3.0)]
+    assert [v.version for v in saved] == ["v000001", "v000002", "v000003"]
+    assert registry.versions() == ["v000001", "v000002", "v000003"]
+    # saving does not activate
+    assert registry.current() is None
+    assert not list(tmp_path.glob(".*.tmp"))
+
+    loaded = registry.load("v000002")
+    assert isinstance(loaded.estimator.coef_, np.memmap)
+    assert loaded.manifest["n_samples"] == 2.0
+    X = np.array([[1e4, 2e4, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]])
+    np.testing.assert_array_equal(loaded.predict(X), saved[1].predict(X))
+    with pytest.raises(KeyError):
+        registry.load("v000009")
+
+
+def test_registry_swaps_current_atomically(tmp_path, monkeypatch):
+    registry = ModelRegistry(tmp_path)
+    for w in (1.0, 2.0):
+        registry.save(_estimator(w))
+    registry.activate("v000001")
+    assert (tmp_path / "CURRENT").read_text() == "v000001"
+
+    # CURRENT only ever changes by an os.replace of a fully written file
+    def failing_replace(src, dst):
+        raise OSError("crash before rename")
+
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        registry.activate("v000002")
+    assert registry.current() == "v000001"
+    monkeypatch.undo()
+
+    registry.activate("v000002")
+    assert registry.current() == "v000002"
+    assert not (tmp_path / "CURRENT.tmp").exists()
+    with pytest.raises(KeyError):
+        registry.activate("v000009")
+    assert registry.current() == "v000002"
+
+
+def test_pruning_never_deletes_the_live_version(tmp_path):
+    registry = ModelRegistry(tmp_path, keep=2)
+    for w in (1.0, 2.0, 3.0):
+        registry.save(_estimator(w))
+    registry.activate("v000001")
+    assert registry.versions() == ["v000001", "v000002", "v000003"]
+
+    match = MatchModel(registry)
+    assert match.load()
+    assert match.version == "v000001"
+    match.publish(_estimator(4.0))
+    assert match.version == "v000004"
+    assert registry.versions() == ["v000003", "v000004"]
+    # numbering continues after pruned versions
+    assert registry.save(_estimator(5.0)).version == "v000005"
+
+
+def test_rollback(tmp_path):
+    match = MatchModel(ModelRegistry(tmp_path))
+    with pytest.raises(KeyError):
+        match.rollback()
+    match.publish(_estimator(1.0))
+    with pytest.raises(KeyError):
+        match.rollback()
+    assert match.version == "v000001"
+
+    match.publish(_estimator(2.0))
+    assert match.rollback() == "v000001"
+    assert match.version == "v000001"
+    assert match.registry.current() == "v000001"
+    # a fresh process picks up the rolled-back version
+    reloaded = MatchModel(ModelRegistry(tmp_path))
+    assert reloaded.load() and reloaded.version == "v000001"
@@ -0,0 +1,78 @@
+import random
+
+import numpy as np
+import pytest
+from app import train
+from app.model import model
+from app.schemas import CompanyIn, LeadIn
+from app.storage import InMemoryStore
+
+REGIONS = ["dach", "uki", "nordics"]
+INDUSTRIES = ["saas", "fintech", "retail"]
+
+
+def _leads(start, stop):
+    return [
+        LeadIn(
+            id=i,
+            region=random.choice(REGIONS),
+            industry=random.choice(INDUSTRIES),
+            budget_normalized_euro=random.uniform(5e3, 5e4),
+        )
+        for i in range(start, stop)
+    ]
+
+
+def _seeded_store():
+    store = InMemoryStore()
+    store.add_many_companies(
+        [
+            CompanyIn(
+                id=j,
+                region=random.choice(REGIONS),
+                industry=random.choice(INDUSTRIES),
+                typical_project_budget_euro=random.uniform(5e3, 5e4),
+            )
+            for j in range(30)
+        ]
+    )
+    store.add_many_leads(_leads(0, 2000))
+    return store
+
+
+@pytest.fixture
+def train_store(monkeypatch, model_registry):
+    random.seed(0)
+    np.random.seed(0)
+    store = _seeded_store()
+    monkeypatch.setattr(train, "store", store)
+    return store
+
+
+def test_incremental_update_stays_close_to_full_fit(train_store):
+    assert train.train_model("full")["mode"] == "full"
+    full = model.live()
+    X = np.array([[2e4, 2e4, r, i] for r in (0.0, 1.0) for i in (0.0, 1.0)])
+
+    train_store.add_many_leads(_leads(2000, 2050))
+    result = train.train_model("incremental")
+
+    assert result["mode"] == "incremental"
+    assert model.live().manifest["watermark"] == train_store.lead_watermark()
+    np.testing.assert_allclose(
+        model.live().estimator.coef_[0, 2:], full.estimator.coef_[0, 2:], atol=0.5
+    )
+    np.testing.assert_allclose(model.live().predict(X), full.predict(X), atol=0.1)
+
+
+def test_incremental_on_another_store_refits(train_store, monkeypatch):
+    train.train_model("full")
+
+    # e.g. the in-memory store after a restart, already past the old watermark
+    restarted = _seeded_store()
+    restarted.add_many_leads(_leads(2000, 2050))
+    monkeypatch.setattr(train, "store", restarted)
+    result = train.train_model("incremental")
+
+    assert result["mode"] == "full"
+    assert model.live().manifest["store_id"] == restarted.store_id
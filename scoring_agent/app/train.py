@@ -1,12 +1,23 @@
+import os
 import random
 
 import numpy as np
+from sklearn.linear_model import SGDClassifier
 from sklearn.metrics import accuracy_score
 from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
 
-from .model import model
+from .engine import LeadColumns, encode_pairs
+from .model import linear_estimator, model
 from .storage import store
 
+TRAIN_MODES = ("full", "incremental")
+TRAIN_MODE = os.getenv("TRAIN_MODE", "full").lower()
+# an incremental run after this many in a row becomes a full refit
+TRAIN_FULL_REFIT_EVERY = int(os.getenv("TRAIN_FULL_REFIT_EVERY", "10"))
+# constant SGD step size of incremental runs, on standardized features
+TRAIN_SGD_ETA0 = float(os.getenv("TRAIN_SGD_ETA0", "0.01"))
+
 
 def _encode_pair(lead, company):
     """
@@ -49,82 +60,195 @@ def _encode_pair(lead, company):
     return [budget_lead, budget_company, region_match, industry_match]
 
 
-def train_model():
+def _build_samples(leads: LeadColumns, companies):
+    """
+    Sample up to 3 companies per lead and label the pairs heuristically.
+
+    Returns:
+        (X, y): features as built by ``encode_pairs`` and 0/1 labels.
+    """
+    n_leads = len(leads)
+    n_companies = len(companies)
+    k = min(n_companies, 3)
+    lead_idx = np.repeat(np.arange(n_leads), k)
+    company_idx = np.array(
+        [j for _ in range(n_leads) for j in random.sample(range(n_companies), k)],
+        dtype=np.intp,
+    )
+    X = encode_pairs(leads, lead_idx, companies, company_idx)
+
+    # heuristic label with slight randomness for diversity
+    lead_budget, comp_budget = X[:, 0], X[:, 1]
+    region_match, industry_match = X[:, 2], X[:, 3]
+
+    # compute normalized budget difference
+    budget_diff_ratio = 1 - np.abs(lead_budget - comp_budget) / (comp_budget + 1e-6)
+    budget_score = np.clip(budget_diff_ratio, 0, 1)
+
+    # weighted heuristic score
+    heuristic = 0.4 * region_match + 0.4 * industry_match + 0.2 * budget_score
+
+    # add controlled randomness so not all are identical
+    y = (np.random.random(len(X)) < heuristic).astype(int)
+    if len(np.unique(y)) < 2:
+        y[random.randrange(len(y))] = (
+            1 - y[random.randrange(len(y))]
+        )  # ensure both classes
+    return X, y
+
+
+def _scaler_state(scaler: StandardScaler) -> dict:
+    return {
+        "mean": scaler.mean_.tolist(),
+        "var": scaler.var_.tolist(),
+        "n_samples_seen": int(scaler.n_samples_seen_),
+    }
+
+
+def _load_scaler(state: dict) -> StandardScaler:
+    scaler = StandardScaler()
+    scaler.mean_ = np.array(state["mean"])
+    scaler.var_ = np.array(state["var"])
+    scaler.scale_ = np.sqrt(scaler.var_)
+    scaler.scale_[scaler.scale_ == 0] = 1.0
+    scaler.n_samples_seen_ = np.int64(state["n_samples_seen"])
+    scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+
+def _fit_full(X, y):
+    """Refit from scratch; the scaler stats seed later incremental runs."""
+    estimator = model.fit(X, y)
+    scaler = StandardScaler().fit(X)
+    return estimator, {"scaler": _scaler_state(scaler)}
+
+
+def _fit_incremental(live, X, y):
+    """
+    Continue from the live model with one ``partial_fit`` pass over ``X``.
+
+    SGD runs on standardized features: the live raw-feature coefficients are
+    mapped into the (updated) scaler's space, updated, and mapped back, so the
+    saved version stays a plain linear model on raw features. Steps are small
+    and constant (``TRAIN_SGD_ETA0``), and the L2 penalty is the
+    LogisticRegression's ``1 / C`` spread over every sample seen so far, so a
+    small batch nudges the model instead of overwriting it.
+    """
+    scaler = _load_scaler(live.manifest["scaler"]).partial_fit(X)
+    coef = np.asarray(live.estimator.coef_)
+    intercept = np.asarray(live.estimator.intercept_)
+    classes = np.asarray(live.estimator.classes_)
+
+    sgd = SGDClassifier(
+        loss="log_loss",
+        alpha=1.0 / (live.estimator.C * scaler.n_samples_seen_),
+        learning_rate="constant",
+        eta0=TRAIN_SGD_ETA0,
+    )
+    # warm start: the state partial_fit would have left after earlier calls
+    sgd.coef_ = coef * scaler.scale_
+    sgd.intercept_ = intercept + coef @ scaler.mean_
+    sgd.classes_ = classes
+    sgd.partial_fit(scaler.transform(X), y, classes=classes)
+
+    raw_coef = sgd.coef_ / scaler.scale_
+    raw_intercept = sgd.intercept_ - raw_coef @ scaler.mean_
+    estimator = linear_estimator(raw_coef, raw_intercept, classes)
+    return estimator, {"scaler": _scaler_state(scaler)}
+
+
+def train_model(mode=None):
     """
-    Train the logistic regression match model.
+    Train the match model, from scratch or incrementally.
 
     Process:
-      1) Read all ingested leads and companies from the in-memory store.
-      2) For each lead, sample up to 3 companies and build feature vectors via _encode_pair.
+      1) Read the ingested leads' feature columns and the columnar company
+         catalog from the store: every lead for a full refit, only the leads
+         ingested since the live version's watermark for an incremental run.
+      2) For each lead, sample up to 3 companies and build feature vectors
+         (same features as _encode_pair, built as one matrix).
       3) Create a probabilistic label from simple heuristics:
            - region match, industry match, and budget similarity,
          then add controlled randomness to avoid degenerate labels.
-      4) Ensure both classes exist, split into train/test, fit the model, and compute accuracy.
+      4) Ensure both classes exist, split into train/test, then either fit a
+         logistic regression from scratch (``full``) or warm-start an
+         ``SGDClassifier(loss="log_loss")`` from the live model and
+         ``partial_fit`` it on the new pairs (``incremental``); compute accuracy.
+      5) Save it as a new registry version, recording the store watermark,
+         and make it live.
+
+    An incremental run falls back to a full refit when there is no live
+    model to continue from, the live model was trained on another store
+    (an in-memory store is a new one after every restart), the store was
+    reset below the watermark, or ``TRAIN_FULL_REFIT_EVERY`` incremental
+    runs happened in a row.
+
+    Args:
+        mode: ``"full"`` or ``"incremental"``; defaults to ``TRAIN_MODE``.
 
     Returns:
         dict: {
           "trained": bool,            # True if model trained
+          "mode": str,                # "full" or "incremental" (as run)
           "n_samples": int,           # number of training samples used
-          "metrics": {"accuracy": float}  # test accuracy (0..1)
+          "metrics": {"accuracy": float},  # test accuracy (0..1)
+          "version": str              # registry version now live
         }
-        If no data is available: {"trained": False, "n_samples": 0, "metrics": {}}
+        If no (new) data is available: {"trained": False, "n_samples": 0, "metrics": {}}
     """
-    leads = store.leads()
-    companies = store.companies()
-    if not leads or not companies:
+    mode = mode or TRAIN_MODE
+    if mode not in TRAIN_MODES:
+        raise ValueError(f"Unknown training mode: {mode!r}")
+    companies = store.company_matrix()
+    watermark = store.lead_watermark()
+
+    live = model.live() if model.trained else None
+    since = 0
+    if mode == "incremental":
+        manifest = live.manifest if live is not None else {}
+        since = manifest.get("watermark", 0)
+        # watermarks only mean something within the store that issued them
+        if (
+            "scaler" not in manifest
+            or manifest.get("store_id") != store.store_id
+            or since > watermark
+            or manifest.get("incremental_runs", 0) >= TRAIN_FULL_REFIT_EVERY
+        ):
+            mode, since = "full", 0
+
+    leads = LeadColumns(
+        *store.lead_feature_columns(companies, since=since, upto=watermark)
+    )
+    if not len(leads) or not len(companies):
         return {"trained": False, "n_samples": 0, "metrics": {}}
 
-    X, y = [], []
-    for lead in leads:
-        for company in random.sample(companies, min(len(companies), 3)):
-            X.append(_encode_pair(lead, company))
-
-            # heuristic label with slight randomness for diversity
-            region_match = (
-                lead.region
-                and company.region
-                and lead.region.lower() == company.region.lower()
-            )
-            industry_match = (
-                lead.industry
-                and company.industry
-                and lead.industry.lower() == company.industry.lower()
-            )
-
-            # compute normalized budget difference
-            lead_budget = lead.budget_normalized_euro or 0
-            comp_budget = company.typical_project_budget_euro or 0
-            budget_diff_ratio = 1 - abs(lead_budget - comp_budget) / (
-                comp_budget + 1e-6
-            )
-            budget_score = max(0, min(1, budget_diff_ratio))
-
-            # weighted heuristic score
-            heuristic = (
-                0.4 * int(region_match) + 0.4 * int(industry_match) + 0.2 * budget_score
-            )
-
-            # add controlled randomness so not all are identical
-            if random.random() < heuristic:
-                y.append(1)
-            else:
-                y.append(0)
-
-    X, y = np.array(X), np.array(y)
-    if len(np.unique(y)) < 2:
-        y[random.randrange(len(y))] = (
-            1 - y[random.randrange(len(y))]
-        )  # ensure both classes
-
+    X, y = _build_samples(leads, companies)
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42
     )
-    model.train(X_train, y_train)
-    y_pred = (model.predict(X_test) > 0.5).astype(int)
-    acc = accuracy_score(y_test, y_pred)
+    if mode == "incremental":
+        estimator, state = _fit_incremental(live, X_train, y_train)
+        runs = live.manifest.get("incremental_runs", 0) + 1
+    else:
+        estimator, state = _fit_full(X_train, y_train)
+        runs = 0
+    y_pred = (estimator.predict_proba(X_test)[:, 1] > 0.5).astype(int)
+    metrics = {"accuracy": float(accuracy_score(y_test, y_pred))}
+    version = model.publish(
+        estimator,
+        n_samples=len(X_train),
+        metrics=metrics,
+        mode=mode,
+        watermark=watermark,
+        store_id=store.store_id,
+        incremental_runs=runs,
+        **state,
+    )
 
     return {
         "trained": True,
+        "mode": mode,
         "n_samples": len(X_train),
-        "metrics": {"accuracy": float(acc)},
+        "metrics": metrics,
+        "version": version.version,
     }